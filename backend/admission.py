@@ -0,0 +1,137 @@
+# ──────────────────────────────────────────────
+# 🚦 admission.py – Concurrency limits & load shedding for /suggest
+# ──────────────────────────────────────────────
+# Global + per-call concurrency caps with a bounded FIFO wait queue.
+# A request is rejected up front (→ 429 + Retry-After) when the queue is
+# full or its expected wait would break the latency SLO. A newer chunk for
+# a call_id replaces that call's still-queued chunk (→ superseded).
+
+import asyncio
+import math
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict
+
+MAX_CONCURRENT = int(os.getenv("CALLMATE_MAX_CONCURRENT", "32"))
+MAX_PER_CALL = int(os.getenv("CALLMATE_MAX_PER_CALL", "1"))
+MAX_QUEUE = int(os.getenv("CALLMATE_MAX_QUEUE", "64"))
+SLO_MS = float(os.getenv("CALLMATE_SLO_MS", "2000"))
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server busy, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Superseded(Exception):
+    pass
+
+
+class _Waiter:
+    __slots__ = ("call_id", "future")
+
+    def __init__(self, call_id: str, future: asyncio.Future):
+        self.call_id = call_id
+        self.future = future
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT, max_per_call: int = MAX_PER_CALL,
+                 max_queue: int = MAX_QUEUE, slo_ms: float = SLO_MS):
+        self.max_concurrent = max_concurrent
+        self.max_per_call = max_per_call
+        self.max_queue = max_queue
+        self.slo_s = slo_ms / 1000.0
+        self.active = 0
+        self.rejected = 0
+        self.superseded = 0
+        self._per_call: Dict[str, int] = defaultdict(int)
+        self._queue: Deque[_Waiter] = deque()
+        self._queued_by_call: Dict[str, _Waiter] = {}
+        self._service_s = 0.5          # EWMA of time spent holding a slot
+
+    # ── sizing ─────────────────────────────────
+    def expected_wait(self) -> float:
+        """Rough queueing delay for a request arriving now."""
+        ahead = len(self._queue) + max(0, self.active - self.max_concurrent + 1)
+        return math.ceil(ahead / self.max_concurrent) * self._service_s
+
+    def _has_room(self, call_id: str) -> bool:
+        return self.active < self.max_concurrent and self._per_call.get(call_id, 0) < self.max_per_call
+
+    def _take(self, call_id: str):
+        self.active += 1
+        self._per_call[call_id] += 1
+
+    # ── admission ──────────────────────────────
+    async def _acquire(self, call_id: str):
+        stale = self._queued_by_call.pop(call_id, None)
+        if stale is not None:
+            self._queue.remove(stale)
+            self.superseded += 1
+            stale.future.set_exception(Superseded())
+
+        # Skip the queue only if no waiter could use the free slot itself;
+        # same eligibility test _release() uses when handing slots out
+        if self._has_room(call_id) and not any(self._has_room(w.call_id) for w in self._queue):
+            self._take(call_id)
+            return
+
+        wait = self.expected_wait()
+        if len(self._queue) >= self.max_queue or wait + self._service_s > self.slo_s:
+            self.rejected += 1
+            raise Overloaded(max(1, math.ceil(wait)))
+
+        waiter = _Waiter(call_id, asyncio.get_running_loop().create_future())
+        self._queue.append(waiter)
+        self._queued_by_call[call_id] = waiter
+        try:
+            await waiter.future          # slot already taken for us by _release
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                self._release(call_id)   # woken and cancelled in the same tick
+            elif waiter in self._queue:
+                self._queue.remove(waiter)
+                self._queued_by_call.pop(call_id, None)
+            raise
+
+    def _release(self, call_id: str):
+        self.active -= 1
+        self._per_call[call_id] -= 1
+        if not self._per_call[call_id]:
+            del self._per_call[call_id]
+
+        # Hand freed capacity to the oldest waiter whose call has room
+        for waiter in list(self._queue):
+            if self.active >= self.max_concurrent:
+                break
+            if self._has_room(waiter.call_id):
+                self._queue.remove(waiter)
+                self._queued_by_call.pop(waiter.call_id, None)
+                self._take(waiter.call_id)
+                waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, call_id: str):
+        await self._acquire(call_id)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._service_s = 0.8 * self._service_s + 0.2 * (time.perf_counter() - start)
+            self._release(call_id)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": len(self._queue),
+            "rejected": self.rejected,
+            "superseded": self.superseded,
+            "service_ms": int(self._service_s * 1000),
+        }
+
+
+controller = AdmissionController()
@@ -1,6 +1,10 @@
 import asyncio
 import random
-from typing import Tuple, List
+from typing import Tuple
+
+from backend.knowledge_index import search as search_playbook
+from backend.sentiment_model import predict_batch
+from backend.summarizer import summarize
 
 # Utility: random confidence score between 80-97 %
 def _rand_conf() -> float:
@@ -11,27 +15,18 @@ def _rand_conf() -> float:
 # Sentiment Agent  →  (sentiment_label, confidence)
 # ─────────────────────────────────────────────────────────────
 async def SentimentAgent(text: str) -> Tuple[str, float]:
-    await asyncio.sleep(0.2)  # simulate latency
-    tl = text.lower()
-
-    if any(kw in tl for kw in ["not happy", "bad", "worst", "angry", "refund"]):
-        return "negative", _rand_conf()
-    if any(kw in tl for kw in ["great", "awesome", "thank you", "love"]):
-        return "positive", _rand_conf()
-    return "neutral", _rand_conf()
+    # Hashed n-gram linear model (falls back to keyword rules if untrained)
+    return predict_batch([text])[0]
 
 
 # ─────────────────────────────────────────────────────────────
 # Knowledge Agent  →  (suggestion_text, confidence)
 # ─────────────────────────────────────────────────────────────
 async def KnowledgeAgent(text: str) -> Tuple[str, float]:
-    await asyncio.sleep(0.3)
-    tl = text.lower()
-
-    if "refund" in tl:
-        suggestion = "Apologize for the inconvenience and assure a quick refund resolution."
-    elif "delay" in tl or "late" in tl:
-        suggestion = "Assure the customer you will check shipment status immediately."
+    # Local BM25 lookup over prompts/suggestions.txt – no LLM round-trip
+    hits = search_playbook(text, k=1)
+    if hits:
+        suggestion = hits[0][0]
     else:
         suggestion = "Thank the customer and offer further help."
 
@@ -57,16 +52,8 @@ async def EscalationAgent(sentiment: str, compliance: str) -> str:
 
 
 # ─────────────────────────────────────────────────────────────
-# Summary Agent  (quick post-call recap)
+# Summary Agent  (extractive recap over the full call transcript)
 # ─────────────────────────────────────────────────────────────
-async def SummaryAgent(conversation: List[str]) -> str:
-    await asyncio.sleep(0.2)
-    if not conversation:
-        return "No conversation to summarise."
-
-    first = conversation[0][:60]
-    last = conversation[-1][:60]
-    return (
-        f"The call began with: “{first} …” and ended with: “{last} …”. "
-        f"Total turns: {len(conversation)}."
-    )
+async def SummaryAgent(call_id: str) -> str:
+    # The transcript is indexed as turns arrive, so this is just a lookup
+    return summarize(call_id)
@@ -0,0 +1,232 @@
+# ──────────────────────────────────────────────
+# 🗄️ archive.py – Compressed, segment-based transcript archive
+# ──────────────────────────────────────────────
+# Finished calls are appended to segment files under archive/:
+#     seg-<created_ms>.cma       records: <u4 length><zlib(JSON)>
+#     seg-<created_ms>.idx.npy   sorted (key, offset, ended) table
+# Only the open segment's index lives in RAM. A sealed segment's index is
+# written once, sorted by call_id hash, and memory-mapped for lookups.
+# Records are read by slicing a memory-mapped segment, so years of
+# transcripts stay on disk.
+#
+# Retention: compact(days) deletes segments whose newest record has
+# expired; nothing is ever rewritten. The server runs it every
+# COMPACT_INTERVAL_S. A segment still being read by get() is closed and
+# deleted by its last reader.
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ARCHIVE_DIR = Path(os.getenv("CALLMATE_ARCHIVE_DIR", "archive"))
+SEGMENT_BYTES = int(os.getenv("CALLMATE_ARCHIVE_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+RETENTION_DAYS = float(os.getenv("CALLMATE_ARCHIVE_RETENTION_DAYS", "730"))
+COMPACT_INTERVAL_S = float(os.getenv("CALLMATE_ARCHIVE_COMPACT_INTERVAL_S", str(6 * 3600)))
+
+_LEN = struct.Struct("<I")
+INDEX_DTYPE = np.dtype([("key", "<u8"), ("offset", "<u8"), ("ended", "<f8")])
+
+
+def _key(call_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(call_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _iter_segment(path: Path) -> Iterator[Tuple[int, dict]]:
+    """(offset, record) for every complete record in a segment file."""
+    data = path.read_bytes()
+    pos = 0
+    while pos + _LEN.size <= len(data):
+        (length,) = _LEN.unpack_from(data, pos)
+        payload = data[pos + _LEN.size:pos + _LEN.size + length]
+        if len(payload) < length:
+            break                                         # torn tail write
+        yield pos, json.loads(zlib.decompress(payload))
+        pos += _LEN.size + length
+
+
+def iter_records(root: Path = ARCHIVE_DIR) -> Iterator[dict]:
+    """Every archived record, read-only (safe next to a running server)."""
+    for path in sorted(root.glob("seg-*.cma")):
+        try:
+            records = list(_iter_segment(path))
+        except FileNotFoundError:
+            continue                                      # removed by compaction meanwhile
+        for _, rec in records:
+            yield rec
+
+
+class _Segment:
+    """A sealed segment: mmapped data + mmapped sorted index."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.readers = 0           # get() calls using this segment (guarded by archive lock)
+        self.retired = False       # removed by compact(); last reader deletes it
+        self.index = np.load(self.index_path(path), mmap_mode="r")
+        self._fh = path.open("rb")
+        self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if path.stat().st_size else None
+
+    @staticmethod
+    def index_path(path: Path) -> Path:
+        return path.with_suffix(".idx.npy")
+
+    def offsets(self, key: int) -> List[int]:
+        keys = self.index["key"]
+        lo = np.searchsorted(keys, np.uint64(key), side="left")
+        hi = np.searchsorted(keys, np.uint64(key), side="right")
+        return [int(o) for o in self.index["offset"][lo:hi]]
+
+    def read(self, offset: int) -> dict:
+        (length,) = _LEN.unpack_from(self._map, offset)
+        start = offset + _LEN.size
+        return json.loads(zlib.decompress(self._map[start:start + length]))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._fh.close()
+
+    def delete(self):
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self.index_path(self.path).unlink(missing_ok=True)
+
+
+class CallArchive:
+    def __init__(self, root: Path = ARCHIVE_DIR, segment_bytes: int = SEGMENT_BYTES):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sealed: List[_Segment] = []
+        for path in sorted(self.root.glob("seg-*.cma")):
+            if _Segment.index_path(path).exists():
+                self._sealed.append(_Segment(path))
+            else:
+                self._seal(path, self._scan(path))      # crashed before sealing
+        self._open_new()
+
+    # ── writing ────────────────────────────────
+    def _open_new(self):
+        # Names sort in creation order; bump if two segments share a millisecond
+        stamp = int(time.time() * 1000)
+        while (self.root / f"seg-{stamp:015d}.cma").exists():
+            stamp += 1
+        self._active_path = self.root / f"seg-{stamp:015d}.cma"
+        self._active = self._active_path.open("ab")
+        self._active_index: Dict[int, List[Tuple[int, float]]] = {}
+
+    @staticmethod
+    def _scan(path: Path) -> Dict[int, List[Tuple[int, float]]]:
+        entries: Dict[int, List[Tuple[int, float]]] = {}
+        for pos, rec in _iter_segment(path):
+            entries.setdefault(_key(rec["call_id"]), []).append((pos, rec.get("ended_at", 0.0)))
+        return entries
+
+    def _seal(self, path: Path, entries: Dict[int, List[Tuple[int, float]]]):
+        rows = [(k, off, ended) for k, items in entries.items() for off, ended in items]
+        if not rows:
+            path.unlink(missing_ok=True)
+            return
+        index = np.array(rows, dtype=INDEX_DTYPE)
+        index.sort(order=["key", "offset"])
+        tmp = path.with_suffix(".tmp.npy")
+        np.save(tmp, index)
+        os.replace(tmp, _Segment.index_path(path))
+        self._sealed.append(_Segment(path))
+
+    def _roll(self):
+        self._active.close()
+        self._seal(self._active_path, self._active_index)
+        self._open_new()
+
+    def append(self, record: dict):
+        """Archives one finished call ({call_id, ended_at, ...})."""
+        payload = zlib.compress(json.dumps(record, ensure_ascii=False).encode("utf-8"), 6)
+        with self._lock:
+            offset = self._active.tell()
+            self._active.write(_LEN.pack(len(payload)) + payload)
+            self._active.flush()
+            self._active_index.setdefault(_key(record["call_id"]), []).append(
+                (offset, record.get("ended_at", time.time())))
+            if self._active.tell() >= self.segment_bytes:
+                self._roll()
+
+    # ── reading ────────────────────────────────
+    def get(self, call_id: str) -> Optional[dict]:
+        """Most recently archived record for `call_id`, or None."""
+        key = _key(call_id)
+        with self._lock:
+            hits = self._active_index.get(key)
+            if hits:
+                with self._active_path.open("rb") as fh:
+                    for offset, _ in reversed(hits):
+                        fh.seek(offset)
+                        (length,) = _LEN.unpack(fh.read(_LEN.size))
+                        rec = json.loads(zlib.decompress(fh.read(length)))
+                        if rec["call_id"] == call_id:
+                            return rec
+            sealed = list(self._sealed)
+            for seg in sealed:
+                seg.readers += 1                            # pins the mmaps against compact()
+        try:
+            for seg in reversed(sealed):
+                for offset in reversed(seg.offsets(key)):
+                    rec = seg.read(offset)
+                    if rec["call_id"] == call_id:            # guard hash collisions
+                        return rec
+            return None
+        finally:
+            with self._lock:
+                for seg in sealed:
+                    seg.readers -= 1
+                    if seg.retired and not seg.readers:
+                        seg.delete()
+
+    # ── retention ──────────────────────────────
+    def compact(self, retention_days: float = RETENTION_DAYS) -> dict:
+        """Deletes sealed segments whose newest record is past retention.
+
+        Records are appended in ended_at order, so segments expire whole;
+        a partly expired segment is kept until its last record expires
+        rather than rewritten (no write amplification).
+        """
+        cutoff = time.time() - retention_days * 86400
+        segments = dropped = 0
+        with self._lock:
+            for seg in [s for s in self._sealed if s.index["ended"].max() < cutoff]:
+                self._sealed.remove(seg)
+                segments += 1
+                dropped += len(seg.index)
+                if seg.readers:
+                    seg.retired = True
+                else:
+                    seg.delete()
+        return {"segments": segments, "dropped": dropped}
+
+    def close(self):
+        with self._lock:
+            self._active.close()
+            for seg in self._sealed:
+                seg.close()
+
+
+_archive: Optional[CallArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> CallArchive:
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = CallArchive()
+        return _archive
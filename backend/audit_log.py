@@ -0,0 +1,169 @@
+# ──────────────────────────────────────────────
+# 🧾 audit_log.py – Non-blocking structured event log
+# ──────────────────────────────────────────────
+# log_event() only stamps a dict and puts it on an in-memory queue; a
+# background thread batches records into rotating JSONL files. Request
+# paths never touch the disk, and a full queue drops (and counts) events
+# instead of applying back-pressure.
+#
+# Each event carries the call_id bound with set_call_id(). Because it is
+# a ContextVar, the id follows the request into gathered agent tasks.
+# Noisy events can be sampled (SAMPLE_RATES) and capped per second
+# (RATE_LIMITS). Compliance events such as consent are never dropped by
+# either.
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Optional
+
+AUDIT_FILE = Path(os.getenv("CALLMATE_AUDIT_FILE", "logs/audit.jsonl"))
+MAX_BYTES = int(os.getenv("CALLMATE_AUDIT_MAX_BYTES", str(50 * 1024 * 1024)))
+BACKUP_COUNT = 10
+MAX_PENDING = 50_000
+
+SAMPLE_RATES: Dict[str, float] = {
+    "suggest": float(os.getenv("CALLMATE_AUDIT_SUGGEST_SAMPLE", "0.1")),
+}
+RATE_LIMITS: Dict[str, float] = {     # events / second
+    "pii_redacted": 100.0,
+    "suggest_rejected": 20.0,
+}
+
+_call_id: ContextVar[Optional[str]] = ContextVar("call_id", default=None)
+
+
+def set_call_id(call_id: Optional[str]):
+    _call_id.set(call_id)
+
+
+# ─────────────────────────────────────────────
+# Background JSONL writer with size rotation
+# ─────────────────────────────────────────────
+class JsonlWriter:
+    def __init__(self, path: Path, max_bytes: int = 0, backup_count: int = BACKUP_COUNT,
+                 max_pending: int = MAX_PENDING):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self.written = 0
+        self._q: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name=f"jsonl-{path.name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record: dict):
+        try:
+            self._q.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0):
+        try:
+            self._q.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _rotate(self, fh):
+        fh.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        return self.path.open("a", encoding="utf-8")
+
+    def _run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fh = self.path.open("a", encoding="utf-8")
+        try:
+            while True:
+                batch = [self._q.get()]
+                while len(batch) < 1000:
+                    try:
+                        batch.append(self._q.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = None in batch
+                lines = [json.dumps(r, ensure_ascii=False, default=str) for r in batch if r is not None]
+                if lines:
+                    fh.write("\n".join(lines) + "\n")
+                    fh.flush()
+                    self.written += len(lines)
+                    if self.max_bytes and fh.tell() >= self.max_bytes:
+                        fh = self._rotate(fh)
+                if stop:
+                    return
+        finally:
+            fh.close()
+
+
+# ─────────────────────────────────────────────
+# Sampling & rate limiting
+# ─────────────────────────────────────────────
+class _TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.stamp = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+_lock = threading.Lock()
+_buckets: Dict[str, _TokenBucket] = {}
+_writer: Optional[JsonlWriter] = None
+_suppressed = 0
+
+
+def _get_writer() -> JsonlWriter:
+    global _writer
+    if _writer is None:
+        with _lock:
+            if _writer is None:
+                _writer = JsonlWriter(AUDIT_FILE, max_bytes=MAX_BYTES)
+    return _writer
+
+
+def log_event(event: str, **fields):
+    """Queues one structured event; never blocks on I/O."""
+    global _suppressed
+    rate = SAMPLE_RATES.get(event)
+    if rate is not None and random.random() >= rate:
+        return
+    limit = RATE_LIMITS.get(event)
+    if limit is not None:
+        with _lock:
+            bucket = _buckets.get(event) or _buckets.setdefault(event, _TokenBucket(limit))
+            allowed = bucket.take()
+            if not allowed:
+                _suppressed += 1
+                return
+
+    record = {"ts": time.time(), "event": event, "call_id": _call_id.get()}
+    record.update(fields)
+    _get_writer().write(record)
+
+
+def stats() -> dict:
+    writer = _writer
+    return {
+        "written": writer.written if writer else 0,
+        "dropped": writer.dropped if writer else 0,
+        "suppressed": _suppressed,
+    }
@@ -9,3 +9,6 @@ def add_utterance(call_id: str, text: str):
 
 def get_context(call_id: str):
     return list(_CONTEXT[call_id])
+
+def drop_context(call_id: str):
+    _CONTEXT.pop(call_id, None)
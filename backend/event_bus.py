@@ -0,0 +1,97 @@
+# ──────────────────────────────────────────────
+# 📡 event_bus.py – In-process pub/sub with SSE fan-out
+# ──────────────────────────────────────────────
+# publish() is called from request handlers on the event loop and never
+# awaits: each event is pushed into every matching subscriber's bounded
+# queue. A slow subscriber loses its oldest events (and is told how many
+# via a "dropped" event) instead of slowing publishers or other clients.
+#
+# GET /events streams the bus as Server-Sent Events:
+#     id: 42
+#     event: escalation
+#     data: {"call_id": "...", ...}
+
+import asyncio
+import itertools
+import json
+import time
+from typing import AsyncIterator, Iterable, Optional, Set
+
+SUBSCRIBER_BUFFER = 256
+HEARTBEAT_S = 15.0
+EVENT_TYPES = ("feedback", "escalation", "latency")
+
+
+class Subscription:
+    def __init__(self, types: Optional[Set[str]], maxsize: int):
+        self.types = types
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: dict):
+        if self.types and event["event"] not in self.types:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()          # drop oldest, keep the stream live
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventBus:
+    def __init__(self, buffer: int = SUBSCRIBER_BUFFER):
+        self.buffer = buffer
+        self._subs: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+        self.published = 0
+
+    def subscribe(self, types: Optional[Iterable[str]] = None) -> Subscription:
+        sub = Subscription(set(types) if types else None, self.buffer)
+        self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self._subs.discard(sub)
+
+    def publish(self, event: str, **data):
+        """Fan out to all subscribers; O(subscribers), never blocks."""
+        self.published += 1
+        if not self._subs:
+            return
+        record = {"id": next(self._ids), "event": event, "ts": time.time(), "data": data}
+        for sub in list(self._subs):
+            sub.offer(record)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subs),
+            "published": self.published,
+            "dropped": sum(s.dropped for s in self._subs),
+        }
+
+
+bus = EventBus()
+
+
+def _format(record: dict) -> str:
+    payload = json.dumps({**record["data"], "ts": record["ts"]}, ensure_ascii=False)
+    return f"id: {record['id']}\nevent: {record['event']}\ndata: {payload}\n\n"
+
+
+async def sse_stream(types: Optional[Iterable[str]] = None) -> AsyncIterator[str]:
+    """Yields SSE frames for one client until it disconnects."""
+    sub = bus.subscribe(types)
+    reported = 0
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                record = await asyncio.wait_for(sub.queue.get(), HEARTBEAT_S)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"             # stops proxies closing idle streams
+                continue
+            if sub.dropped > reported:
+                yield f"event: dropped\ndata: {json.dumps({'count': sub.dropped - reported})}\n\n"
+                reported = sub.dropped
+            yield _format(record)
+    finally:
+        bus.unsubscribe(sub)
@@ -1,39 +1,194 @@
 # backend/feedback_store.py
 
+import csv
+import io
 import json
+import textwrap
 from pathlib import Path
 from datetime import datetime
+from typing import Iterator, List, Optional
+
+import numpy as np
 
 # Path to the feedback storage file
 FILE_PATH = Path("feedback.json")
 
 # Save a new feedback entry with timestamp
-def save_feedback(call_id: str, text: str, helpful: bool):
-    feedback = load_feedback()
-    feedback.append({
+def save_feedback(call_id: str, text: str, helpful: bool, sentiment: Optional[str] = None):
+    entry = {
         "call_id": call_id,
         "text": text,
         "helpful": helpful,
         "timestamp": datetime.utcnow().isoformat()  # Add UTC timestamp
-    })
-    FILE_PATH.write_text(json.dumps(feedback, indent=2))
+    }
+    if sentiment:
+        entry["sentiment"] = sentiment  # agent-confirmed label for model training
+    before = _mtime()
+    _append_entry(entry)
+
+    # Patch the parsed rows and aggregates in place instead of re-reading the file
+    after = _mtime()
+    if _cache["mtime"] == before:
+        _cache["rows"].append(entry)
+        _cache["mtime"] = after
+    if "slots" in _agg and _agg["mtime"] == before:
+        _agg_add(_agg, *_timestamps([entry]), [entry])
+        _agg["mtime"] = after
+
+
+def _append_entry(entry: dict):
+    """Appends to the JSON array on disk without rewriting what is already there."""
+    body = textwrap.indent(json.dumps(entry, indent=2), "  ").encode()
+    if not FILE_PATH.exists() or not FILE_PATH.stat().st_size:
+        FILE_PATH.write_bytes(b"[\n" + body + b"\n]")
+        return
+    with FILE_PATH.open("r+b") as fh:
+        fh.seek(max(0, fh.seek(0, 2) - 64))
+        tail = fh.read()
+        close = tail.rfind(b"]")
+        if close < 0:
+            raise ValueError(f"{FILE_PATH} is not a JSON array")
+        head = tail[:close].rstrip()               # up to the last "}" (or "[")
+        fh.seek(fh.tell() - len(tail) + len(head))
+        fh.write((b"\n" if head.endswith(b"[") else b",\n") + body + b"\n]")
+        fh.truncate()
+
+
+def _mtime() -> Optional[int]:
+    try:
+        return FILE_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
 
 
-# Load all feedback entries from file
+# Load all feedback entries from file (parsed once per file change)
+_cache = {"mtime": None, "rows": []}
+
 def load_feedback():
-    if FILE_PATH.exists():
-        return json.loads(FILE_PATH.read_text())
-    return []
+    mtime = _mtime()
+    if mtime is None:
+        return []
+    if _cache["mtime"] != mtime:
+        _cache["rows"] = json.loads(FILE_PATH.read_text())
+        _cache["mtime"] = mtime
+    return _cache["rows"]
 
 
 # Count summary of 👍 / 👎 feedback
 def count_feedback() -> dict:
+    agg = _aggregates()
+    return {"👍": agg["up"], "👎": agg["total"] - agg["up"]}
+
+
+# Return feedback including timestamps, optionally one page (newest first)
+def load_feedback_history(offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+    feedback = load_feedback()
+    if limit is None:
+        return feedback
+    end = len(feedback) - offset
+    return feedback[max(0, end - limit):max(0, end)][::-1]
+
+
+# ─────────────────────────────────────────────
+# Server-side aggregation for the dashboard
+# ─────────────────────────────────────────────
+BUCKETS = {"minute": 60, "5min": 300, "hour": 3600, "day": 86400, "week": 604800}
+MAX_POINTS = 500
+
+def _timestamps(feedback: List[dict]):
+    """(epoch seconds, helpful flags) for rows with a parseable timestamp."""
+    rows = [f for f in feedback if f.get("timestamp")]
+    helpful = np.fromiter((bool(f.get("helpful")) for f in rows), dtype=bool, count=len(rows))
+    try:
+        stamps = np.array([f["timestamp"] for f in rows], dtype="datetime64[us]")
+    except ValueError:
+        # Slow path: drop rows whose timestamp doesn't parse
+        parsed = []
+        for f in rows:
+            try:
+                parsed.append(np.datetime64(f["timestamp"], "us"))
+            except ValueError:
+                parsed.append(np.datetime64("NaT"))
+        stamps = np.array(parsed, dtype="datetime64[us]")
+    ok = ~np.isnat(stamps)
+    return stamps[ok].astype("datetime64[s]").astype(np.int64), helpful[ok]
+
+
+# Running totals and per-bucket 👍 / total counts, built from the file once
+# and then updated by save_feedback(), so appends never trigger a re-scan
+_agg = {"mtime": None}
+
+def _agg_add(agg: dict, secs: np.ndarray, helpful: np.ndarray, rows: List[dict]):
+    agg["up"] += sum(1 for f in rows if f.get("helpful"))
+    agg["total"] += len(rows)
+    if not len(secs):
+        return
+    agg["min"] = min(agg["min"], int(secs.min())) if agg["min"] is not None else int(secs.min())
+    agg["max"] = max(agg["max"], int(secs.max())) if agg["max"] is not None else int(secs.max())
+    for name, width in BUCKETS.items():
+        uniq, inverse = np.unique(secs // width, return_inverse=True)
+        up = np.bincount(inverse, weights=helpful, minlength=len(uniq))
+        total = np.bincount(inverse, minlength=len(uniq))
+        counts = agg["slots"][name]
+        for slot, u, n in zip(uniq.tolist(), up.tolist(), total.tolist()):
+            c = counts.setdefault(slot, [0, 0])
+            c[0] += int(u)
+            c[1] += n
+
+
+def _aggregates() -> dict:
     feedback = load_feedback()
-    helpful = sum(1 for f in feedback if f.get("helpful"))
-    not_helpful = sum(1 for f in feedback if not f.get("helpful"))
-    return {"👍": helpful, "👎": not_helpful}
+    if _agg["mtime"] != _cache["mtime"] or _cache["mtime"] is None:
+        _agg.clear()
+        _agg.update(mtime=_cache["mtime"], up=0, total=0, min=None, max=None,
+                    slots={name: {} for name in BUCKETS})
+        _agg_add(_agg, *_timestamps(feedback), feedback)
+    return _agg
+
+
+_timeline_cache = {}
+
+def feedback_timeline(bucket: str = "auto") -> dict:
+    """👍 / 👎 counts per time bucket; `auto` keeps it under MAX_POINTS buckets."""
+    agg = _aggregates()
+    key = (agg["mtime"], bucket)
+    if key not in _timeline_cache:
+        _timeline_cache.clear()
+        _timeline_cache[key] = _points(agg, bucket)
+    return _timeline_cache[key]
+
+
+def _points(agg: dict, bucket: str) -> dict:
+    if agg["min"] is None:
+        return {"bucket": bucket, "points": []}
+
+    if bucket not in BUCKETS:
+        span = agg["max"] - agg["min"]
+        bucket = next((b for b, w in BUCKETS.items() if span / w <= MAX_POINTS), "week")
+    width = BUCKETS[bucket]
+
+    counts = agg["slots"][bucket]
+    slots = sorted(counts)
+    times = (np.array(slots, dtype=np.int64) * width).astype("datetime64[s]").astype(str)
+    return {
+        "bucket": bucket,
+        "points": [
+            {"t": t, "👍": counts[slot][0], "👎": counts[slot][1] - counts[slot][0]}
+            for t, slot in zip(times, slots)
+        ],
+    }
 
 
-# Return all feedback including timestamps (used for graph in dashboard)
-def load_feedback_history():
-    return load_feedback()
+def iter_feedback_csv() -> Iterator[str]:
+    """Yields the feedback log as CSV, a few hundred rows per chunk."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["timestamp", "call_id", "text", "feedback"])
+    for i, f in enumerate(load_feedback(), 1):
+        writer.writerow([f.get("timestamp", ""), f.get("call_id", ""), f.get("text", ""),
+                         "👍" if f.get("helpful") else "👎"])
+        if i % 500 == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
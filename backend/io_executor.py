@@ -0,0 +1,115 @@
+# ──────────────────────────────────────────────
+# 🧵 io_executor.py – Blocking storage calls off the event loop
+# ──────────────────────────────────────────────
+# One small, dedicated thread pool per storage backend, so a slow disk or
+# SQLite commit never stalls /suggest and backends can't starve each other.
+# Single-worker pools also serialise read-modify-write JSON updates.
+#
+#     result = await run_io("json", save_consent, call_id, consent)
+#
+# Queue depth, wait and run times per pool plus event-loop lag are exposed
+# through io_stats().
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+# backend → (worker threads, max queued calls before callers wait in-loop)
+POOLS = {
+    "json": (1, 256),      # feedback.json / consent_log.json rewrites, CSV export
+    "archive": (2, 128),   # call archive appends, mmap reads, compaction
+}
+
+
+class IOPool:
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"io-{name}")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.max_queue = max_queue
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.wait_ms_total = 0.0
+        self.run_ms_total = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_queue)
+        queued_at = time.perf_counter()
+
+        def _timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.wait_ms_total += (started - queued_at) * 1000
+                self.run_ms_total += (time.perf_counter() - started) * 1000
+
+        async with self._slots:
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, _timed)
+            finally:
+                self.pending -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        done = max(self.completed, 1)
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "avg_wait_ms": round(self.wait_ms_total / done, 2),
+            "avg_run_ms": round(self.run_ms_total / done, 2),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_pools: Dict[str, IOPool] = {name: IOPool(name, *cfg) for name, cfg in POOLS.items()}
+
+
+async def run_io(pool: str, fn: Callable, *args, **kwargs):
+    """Runs blocking `fn` on the named backend's pool and awaits the result."""
+    return await _pools[pool].run(partial(fn, *args, **kwargs))
+
+
+async def iter_io(pool: str, iterator: Iterator) -> AsyncIterator:
+    """Drives a blocking iterator on the named pool, one next() per call."""
+    done = object()
+    while True:
+        item = await run_io(pool, next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+
+# ─────────────────────────────────────────────
+# Event-loop lag probe
+# ─────────────────────────────────────────────
+_lag = {"last_ms": 0.0, "max_ms": 0.0}
+
+
+async def monitor_loop_lag(interval: float = 0.5):
+    """Measures how late the loop wakes a sleeper; run as a background task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, (loop.time() - start - interval) * 1000)
+        _lag["last_ms"] = round(lag, 2)
+        _lag["max_ms"] = max(_lag["max_ms"], _lag["last_ms"])
+
+
+def io_stats() -> dict:
+    return {"pools": {name: p.stats() for name, p in _pools.items()}, "loop_lag_ms": dict(_lag)}
+
+
+def shutdown():
+    for pool in _pools.values():
+        pool.shutdown()
@@ -0,0 +1,153 @@
+# ──────────────────────────────────────────────
+# 📚 knowledge_index.py – BM25 index over the suggestion playbook
+# ──────────────────────────────────────────────
+# Playbook format (prompts/suggestions.txt), one entry per line:
+#     refund, money back | Apologize and assure a quick refund resolution.
+# Text before "|" is extra trigger text; lines without "|" are indexed on the
+# suggestion itself. Blank lines and lines starting with "#" are skipped.
+#
+# The index is stored term-major (CSC-style) over hashed token slots, so a
+# lookup touches only the postings of the query terms. Rebuilds on file
+# change happen on a background thread and swap in atomically; the first
+# build runs at server startup.
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from backend.audit_log import log_event
+from backend.text_features import hash_token, ngrams, tokenize
+
+PLAYBOOK_PATH = Path(os.getenv("CALLMATE_PLAYBOOK", "prompts/suggestions.txt"))
+HASH_DIM = 1 << 18
+K1, B = 1.2, 0.75
+RELOAD_CHECK_S = 5.0     # how often lookups stat() the playbook
+
+
+class KnowledgeIndex:
+    def __init__(self, entries: List[Tuple[str, str]], dim: int = HASH_DIM):
+        self.dim = dim
+        self.suggestions = [s for _, s in entries]
+        n = len(entries)
+
+        docs, slots, tfs = [], [], []
+        lengths = np.zeros(n, dtype=np.float32)
+        for d, (trigger, suggestion) in enumerate(entries):
+            toks = ngrams(tokenize(f"{trigger} {suggestion}", drop_stopwords=True))
+            lengths[d] = len(toks)
+            if not toks:
+                continue
+            uniq, counts = np.unique([hash_token(t, dim) for t in toks], return_counts=True)
+            docs.append(np.full(len(uniq), d, dtype=np.int32))
+            slots.append(uniq)
+            tfs.append(counts.astype(np.float32))
+
+        if docs:
+            docs, slots, tfs = np.concatenate(docs), np.concatenate(slots), np.concatenate(tfs)
+        else:
+            docs, slots, tfs = (np.empty(0, np.int32), np.empty(0, np.int64), np.empty(0, np.float32))
+
+        # Precompute full BM25 term weights per posting
+        df = np.bincount(slots, minlength=dim).astype(np.float32)
+        idf = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        avgdl = lengths.mean() if n else 1.0
+        norm = K1 * (1.0 - B + B * lengths[docs] / max(avgdl, 1e-9))
+        weights = idf[slots] * tfs * (K1 + 1.0) / (tfs + norm)
+
+        order = np.argsort(slots, kind="stable")
+        self._docs = docs[order]
+        self._weights = weights[order].astype(np.float32)
+        self._indptr = np.zeros(dim + 1, dtype=np.int64)
+        np.cumsum(np.bincount(slots, minlength=dim), out=self._indptr[1:])
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def search(self, text: str, k: int = 3) -> List[Tuple[str, float]]:
+        n = len(self.suggestions)
+        if not n:
+            return []
+        slots = {hash_token(t, self.dim) for t in ngrams(tokenize(text, drop_stopwords=True))}
+        spans = [(self._indptr[s], self._indptr[s + 1]) for s in slots]
+        spans = [(a, b) for a, b in spans if b > a]
+        if not spans:
+            return []
+
+        docs = np.concatenate([self._docs[a:b] for a, b in spans])
+        weights = np.concatenate([self._weights[a:b] for a, b in spans])
+        scores = np.bincount(docs, weights=weights, minlength=n)
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.suggestions[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+def load_playbook(path: Path) -> List[Tuple[str, str]]:
+    entries = []
+    if not path.exists():
+        return entries
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        trigger, sep, suggestion = line.partition("|")
+        if not sep:
+            trigger, suggestion = "", trigger
+        if suggestion.strip():
+            entries.append((trigger.strip(), suggestion.strip()))
+    return entries
+
+
+# ─────────────────────────────────────────────
+# Shared index with non-blocking hot reload
+# ─────────────────────────────────────────────
+_index: Optional[KnowledgeIndex] = None
+_mtime: Optional[float] = None
+_next_check = 0.0
+_rebuild_lock = threading.Lock()
+
+
+def _mtime_of(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _rebuild(mtime: Optional[float]):
+    global _index, _mtime
+    try:
+        _index = KnowledgeIndex(load_playbook(PLAYBOOK_PATH))
+    except Exception as e:
+        # Keep serving the previous (or an empty) index; retried on the next file change
+        log_event("playbook_reload_failed", path=str(PLAYBOOK_PATH), error=str(e))
+        if _index is None:
+            _index = KnowledgeIndex([])
+    finally:
+        _mtime = mtime
+        _rebuild_lock.release()
+
+
+def get_index() -> Optional[KnowledgeIndex]:
+    """Returns the current index; kicks off a background rebuild if the file changed."""
+    global _next_check
+    now = time.monotonic()
+    if now >= _next_check:
+        _next_check = now + RELOAD_CHECK_S
+        mtime = _mtime_of(PLAYBOOK_PATH)
+        if (_index is None or mtime != _mtime) and _rebuild_lock.acquire(blocking=False):
+            if _index is None:
+                _rebuild(mtime)          # first load (normally done at startup)
+            else:
+                threading.Thread(target=_rebuild, args=(mtime,), daemon=True).start()
+    return _index
+
+
+def search(text: str, k: int = 3) -> List[Tuple[str, float]]:
+    index = get_index()
+    return index.search(text, k) if index else []
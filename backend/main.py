@@ -3,12 +3,21 @@
 # Fully Updated with Feedback History, Summary, and Consent
 # ───────────────────────────────────────────────────────
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
+from typing import Literal, Optional
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
 import asyncio, time, json
 from pathlib import Path
-from backend.context_store import add_utterance, get_context
+from backend.archive import get_archive, COMPACT_INTERVAL_S
+from backend.event_bus import bus, sse_stream, EVENT_TYPES
+from backend.io_executor import run_io, iter_io, io_stats, monitor_loop_lag, shutdown as shutdown_io
+from backend.context_store import add_utterance, drop_context
+from backend.summarizer import (
+    add_turn, drop_call, dropped_turns, first_delivery, get_transcript, has_call, idle_calls
+)
 from backend.agents import (
     SentimentAgent,
     KnowledgeAgent,
@@ -16,14 +25,60 @@ from backend.agents import (
     EscalationAgent,
     SummaryAgent
 )
-from backend.pii_redactor import redact
+from backend.audit_log import log_event, set_call_id, stats as audit_stats
+from backend.admission import controller as admission, Overloaded, Superseded
+from backend.pii_redactor import redact, stream_for, pending_text, close_stream
+from backend.sentiment_model import predict_batch
+from backend.trace import install as install_trace
+from backend.name_matcher import get_index as load_name_index
+from backend.knowledge_index import get_index as load_playbook_index
 from backend.feedback_db import save_feedback_sql as save_feedback
 from backend.feedback_db import summary_sql as count_feedback
-from backend.feedback_store import save_feedback, count_feedback, load_feedback_history
+from backend.feedback_store import (
+    save_feedback, count_feedback, load_feedback_history, feedback_timeline, iter_feedback_csv
+)
 
 load_dotenv()
 
-app = FastAPI(title="CallMate AI – Backend")
+# ───────────────────────────────────────────────────────
+# Lifecycle: background tasks & I/O pools
+# ───────────────────────────────────────────────────────
+async def compact_archive():
+    """Applies archive retention periodically, on the archive I/O pool."""
+    while True:
+        try:
+            result = await run_io("archive", lambda: get_archive().compact())
+            if result["segments"]:
+                log_event("archive_compacted", **result)
+        except Exception as e:               # keep retrying on the next round
+            log_event("archive_compact_failed", error=str(e))
+        await asyncio.sleep(COMPACT_INTERVAL_S)
+
+async def end_idle_calls(interval: float = 60.0):
+    """Ends and archives calls whose client went away without /calls/{id}/end."""
+    while True:
+        await asyncio.sleep(interval)
+        for call_id in idle_calls():
+            set_call_id(call_id)
+            try:
+                await finish_call(call_id, reason="idle")
+            except Exception as e:           # retried on the next sweep
+                log_event("call_end_failed", error=str(e))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    load_name_index()       # builds data/names.idx.npy if missing
+    load_playbook_index()   # first /suggest must not pay for the BM25 build
+    tasks = [asyncio.create_task(monitor_loop_lag()), asyncio.create_task(compact_archive()),
+             asyncio.create_task(end_idle_calls())]
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    shutdown_io()
+
+app = FastAPI(title="CallMate AI – Backend", lifespan=lifespan)
+install_trace(app)  # request capture, only when CALLMATE_TRACE is set
 
 # ───────────────────────────────────────────────────────
 # Input model
@@ -31,6 +86,7 @@ app = FastAPI(title="CallMate AI – Backend")
 class TranscriptChunk(BaseModel):
     text: str
     call_id: str
+    chunk_id: Optional[str] = None   # set by clients that retry, to dedupe resends
 
 # ───────────────────────────────────────────────────────
 # Health Check
@@ -39,23 +95,74 @@ class TranscriptChunk(BaseModel):
 async def root():
     return {"status": "backend up"}
 
+# ───────────────────────────────────────────────────────
+# I/O metrics
+# ───────────────────────────────────────────────────────
+@app.get("/metrics/io")
+async def io_metrics():
+    return {**io_stats(), "events": bus.stats()}
+
+# ───────────────────────────────────────────────────────
+# Live Event Stream (SSE)
+# ───────────────────────────────────────────────────────
+@app.get("/events")
+async def events(types: Optional[str] = None):
+    wanted = [t for t in (types or "").split(",") if t in EVENT_TYPES] or None
+    return StreamingResponse(
+        sse_stream(wanted),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # ───────────────────────────────────────────────────────
 # Main Suggestion Endpoint
 # ───────────────────────────────────────────────────────
+def _record_chunk(chunk: TranscriptChunk):
+    # Stored context only gets turns the call's stream redactor has fully
+    # released, so PII split across two chunks never lands in the transcript
+    if not first_delivery(chunk.call_id, chunk.chunk_id):
+        return
+    for turn in stream_for(chunk.call_id).feed(chunk.text):
+        add_utterance(chunk.call_id, turn)
+        add_turn(chunk.call_id, turn)
+
+
 @app.post("/suggest")
 async def suggest(chunk: TranscriptChunk):
+    set_call_id(chunk.call_id)   # correlates every audit event of this request
     safe_text = redact(chunk.text)
-    add_utterance(chunk.call_id, safe_text)
+
+    # Every chunk is recorded, even if shed below: the transcript must not
+    # lose speech under overload. Retries carrying the same chunk_id are skipped
+    _record_chunk(chunk)
     start_time = time.time()
 
-    (sentiment, s_conf), (suggestion, k_conf), (compliance, c_conf) = await asyncio.gather(
-        SentimentAgent(safe_text),
-        KnowledgeAgent(safe_text),
-        ComplianceAgent(safe_text),
-    )
+    # Admission control: fail fast under overload instead of queueing forever
+    try:
+        async with admission.slot(chunk.call_id):
+            (sentiment, s_conf), (suggestion, k_conf), (compliance, c_conf) = await asyncio.gather(
+                SentimentAgent(safe_text),
+                KnowledgeAgent(safe_text),
+                ComplianceAgent(safe_text),
+            )
+            escalation = await EscalationAgent(sentiment, compliance)
+    except Overloaded as e:
+        log_event("suggest_rejected", retry_after=e.retry_after)
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except Superseded:
+        return JSONResponse(status_code=409, content={"detail": "Superseded by a newer chunk for this call"})
 
-    escalation = await EscalationAgent(sentiment, compliance)
     latency_ms = int((time.time() - start_time) * 1000)
+    log_event("suggest", latency_ms=latency_ms, sentiment=sentiment,
+              compliance=compliance, escalation=escalation)
+    bus.publish("latency", call_id=chunk.call_id, latency_ms=latency_ms)
+    if escalation == "Recommended":
+        # Labels only: events fan out to every dashboard, transcript text stays out
+        bus.publish("escalation", call_id=chunk.call_id, sentiment=sentiment, compliance=compliance)
 
     return {
         "suggestion": f"{suggestion} (via multi-agent)",
@@ -72,6 +179,11 @@ async def suggest(chunk: TranscriptChunk):
         "latency_ms": latency_ms,
     }
 
+
+@app.get("/suggest/stats")
+async def suggest_stats():
+    return {**admission.stats(), "audit": audit_stats()}
+
 # ───────────────────────────────────────────────────────
 # Consent Logging
 # ───────────────────────────────────────────────────────
@@ -86,7 +198,9 @@ def save_consent(call_id: str, consent: bool):
 
 @app.post("/consent")
 async def consent(call_id: str, consent: bool):
-    save_consent(call_id, consent)
+    set_call_id(call_id)
+    log_event("consent", consent=consent)
+    await run_io("json", save_consent, call_id, consent)
     return {"message": "Consent stored"}
 
 # ───────────────────────────────────────────────────────
@@ -96,36 +210,51 @@ class FeedbackItem(BaseModel):
     call_id: str
     text: str
     helpful: bool
+    sentiment: Optional[Literal["negative", "neutral", "positive"]] = None
 
 @app.post("/feedback")
 async def feedback(item: FeedbackItem):
-    save_feedback(item.call_id, item.text, item.helpful)
-    save_feedback_history(item.call_id, item.text, item.helpful)
+    set_call_id(item.call_id)
+    log_event("feedback", helpful=item.helpful, sentiment=item.sentiment)
+    await run_io("json", save_feedback, item.call_id, item.text, item.helpful, item.sentiment)
+    bus.publish("feedback", call_id=item.call_id, helpful=item.helpful)
     return {"message": "Feedback recorded"}
 
-from fastapi.responses import JSONResponse
-
 @app.get("/feedback/summary")
 async def feedback_summary():
-    summary_data = count_feedback() or {}
+    summary_data = await run_io("json", count_feedback) or {}
     return JSONResponse(content=summary_data)
 
 
 @app.get("/feedback/history")
-async def feedback_history():
-    return load_feedback_history()
+async def feedback_history(offset: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1, le=1000)):
+    # Without `limit` the full log is returned (legacy); with it, one page newest-first
+    return await run_io("json", load_feedback_history, offset, limit)
+
+
+@app.get("/feedback/timeline")
+async def feedback_timeline_view(bucket: str = "auto"):
+    return await run_io("json", feedback_timeline, bucket)
+
+
+@app.get("/feedback/export.csv")
+async def feedback_export():
+    # Rows are produced lazily on the json pool as the client reads
+    return StreamingResponse(
+        iter_io("json", iter_feedback_csv()),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=callmate_feedback.csv"},
+    )
 
 # ───────────────────────────────────────────────────────
 # Post-call Summary Report
 # ───────────────────────────────────────────────────────
-@app.get("/summary/{call_id}")
-async def post_call_summary(call_id: str):
-    context = get_context(call_id)
-    summary = await SummaryAgent(context)
+def build_report(summary: str, context: list) -> dict:
     overall_sentiment = "neutral"
     overall_compliance = "clean"
 
-    if any("refund" in line.lower() or "angry" in line.lower() for line in context):
+    # One batched pass over the whole call; any clearly negative turn counts
+    if any(label == "negative" for label, _ in predict_batch(context)):
         overall_sentiment = "negative"
 
     if any("card" in line.lower() or "cvv" in line.lower() for line in context):
@@ -143,3 +272,50 @@ async def post_call_summary(call_id: str):
         "utterances": context,
         "voice_quality": 88  # Simulated for now, could be calculated from audio in future
     }
+
+@app.get("/summary/{call_id}")
+async def post_call_summary(call_id: str):
+    context = get_transcript(call_id)
+    if not context:
+        # Finished calls are served from the on-disk archive
+        record = await run_io("archive", lambda: get_archive().get(call_id))
+        if record:
+            return build_report(record["summary"], record["utterances"])
+
+    pending = pending_text(call_id)
+    if pending:
+        context.append(pending)
+    summary = await SummaryAgent(call_id)
+    return build_report(summary, context)
+
+# ───────────────────────────────────────────────────────
+# End of Call → Archive
+# ───────────────────────────────────────────────────────
+async def finish_call(call_id: str, reason: str = "ended") -> dict:
+    """Flushes, reports and archives a call, then drops all of its live state."""
+    for turn in close_stream(call_id):
+        add_turn(call_id, turn)
+    context = get_transcript(call_id)
+    summary = await SummaryAgent(call_id)
+    report = build_report(summary, context)
+
+    if context:
+        record = {"call_id": call_id, "ended_at": time.time(), "summary": summary, "utterances": context}
+        dropped = dropped_turns(call_id)
+        if dropped:
+            record["dropped_turns"] = dropped    # transcript hit MAX_TURNS
+        await run_io("archive", lambda: get_archive().append(record))
+        log_event("call_archived", turns=len(context), dropped_turns=dropped, reason=reason)
+    drop_call(call_id)
+    drop_context(call_id)
+    return report
+
+@app.post("/calls/{call_id}/end")
+async def end_call(call_id: str):
+    set_call_id(call_id)
+    if not has_call(call_id):
+        # Already ended (e.g. expired while idle): report from the archive
+        record = await run_io("archive", lambda: get_archive().get(call_id))
+        if record:
+            return build_report(record["summary"], record["utterances"])
+    return await finish_call(call_id)
@@ -0,0 +1,182 @@
+# ──────────────────────────────────────────────
+# 🪪 name_matcher.py – Dictionary matching for customer names
+# ──────────────────────────────────────────────
+# Names (one per line in data/names.txt) are compiled into a token trie
+# stored as an open-addressing hash table: every trie node is the 63-bit
+# hash of its token path, and the top bit marks nodes that end a name.
+# The table is a single uint64 .npy, memory-mapped on load, so 10^6 names
+# cost no startup parse and each token step is one O(1) probe – match time
+# per chunk does not depend on dictionary size.
+#
+#     python -m backend.name_matcher build [names.txt] [names.idx.npy]
+#
+# The index is a build artifact (not committed): the server builds it on
+# start if missing, rebuilds it in the background when names.txt is newer,
+# and swaps new indexes in atomically. Until then it keeps matching with
+# the old index, so names are never released unmasked.
+
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+NAMES_FILE = Path(os.getenv("CALLMATE_NAMES_FILE", "data/names.txt"))
+NAMES_INDEX = Path(os.getenv("CALLMATE_NAMES_INDEX", "data/names.idx.npy"))
+MAX_NAME_WORDS = 3
+RELOAD_CHECK_S = 5.0
+
+TOKEN_RE = re.compile(r"[\w']+")
+TERMINAL = np.uint64(1 << 63)
+HASH_MASK = (1 << 63) - 1
+
+
+def _step(node: int, token: str) -> int:
+    digest = hashlib.blake2b(token.lower().encode("utf-8"), digest_size=8,
+                             key=node.to_bytes(8, "little")).digest()
+    return (int.from_bytes(digest, "little") & HASH_MASK) or 1   # 0 = empty slot
+
+
+ROOT = 0
+
+
+class NameIndex:
+    def __init__(self, table: np.ndarray):
+        self.table = table
+        self._mask = len(table) - 1
+
+    def _probe(self, node: int) -> Optional[bool]:
+        """None if `node` is not in the trie, else whether it ends a name."""
+        table, i = self.table, node & self._mask
+        while True:
+            key = int(table[i])
+            if not key:
+                return None
+            if key & HASH_MASK == node:
+                return bool(key >> 63)
+            i = (i + 1) & self._mask
+
+    def find_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Character spans of the longest dictionary names in `text`."""
+        tokens = list(TOKEN_RE.finditer(text))
+        spans, i = [], 0
+        while i < len(tokens):
+            node, end = ROOT, None
+            for j in range(i, min(i + MAX_NAME_WORDS, len(tokens))):
+                node = _step(node, tokens[j].group())
+                hit = self._probe(node)
+                if hit is None:
+                    break
+                if hit:
+                    end = j
+            if end is None:
+                i += 1
+            else:
+                spans.append((tokens[i].start(), tokens[end].end()))
+                i = end + 1
+        return spans
+
+
+def build_table(names: Iterable[str]) -> np.ndarray:
+    nodes = {}
+    for name in names:
+        tokens = TOKEN_RE.findall(name)
+        if not tokens or len(tokens) > MAX_NAME_WORDS:
+            continue
+        node = ROOT
+        for depth, tok in enumerate(tokens, 1):
+            node = _step(node, tok)
+            nodes[node] = nodes.get(node, False) or depth == len(tokens)
+
+    size = 1 << max(4, (2 * len(nodes)).bit_length())   # load factor ≤ 0.5
+    table = np.zeros(size, dtype=np.uint64)
+    mask = size - 1
+    for node, terminal in nodes.items():
+        i = node & mask
+        while table[i]:
+            i = (i + 1) & mask
+        table[i] = np.uint64(node) | (TERMINAL if terminal else np.uint64(0))
+    return table
+
+
+def compile_names(src: Path = None, dst: Path = None):
+    src, dst = src or NAMES_FILE, dst or NAMES_INDEX
+    lines = src.read_text(encoding="utf-8").splitlines() if src.exists() else []
+    table = build_table(l for l in lines if l.strip() and not l.startswith("#"))
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_suffix(".tmp.npy")
+    np.save(tmp, table)
+    os.replace(tmp, dst)      # readers see the old or new file, never half of one
+
+
+def load_index(path: Path = None) -> NameIndex:
+    return NameIndex(np.load(path or NAMES_INDEX, mmap_mode="r"))
+
+
+# ─────────────────────────────────────────────
+# Shared index with atomic hot reload
+# ─────────────────────────────────────────────
+_index: Optional[NameIndex] = None
+_loaded_mtime: Optional[float] = None
+_next_check = 0.0
+_rebuild_lock = threading.Lock()
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _load():
+    global _index, _loaded_mtime
+    mtime = _mtime(NAMES_INDEX)
+    if mtime is not None:
+        _index, _loaded_mtime = load_index(), mtime
+
+
+def _refresh(build: bool):
+    try:
+        if build:
+            compile_names()
+        _load()
+    finally:
+        _rebuild_lock.release()
+
+
+def get_index() -> Optional[NameIndex]:
+    global _next_check
+    now = time.monotonic()
+    if now < _next_check:
+        return _index
+    _next_check = now + RELOAD_CHECK_S
+
+    src, idx = _mtime(NAMES_FILE), _mtime(NAMES_INDEX)
+    stale = src is not None and (idx is None or src > idx)
+    if _index is None and idx is not None:
+        _load()                            # mmap load is instant; stale beats unmasked
+    if (stale or idx != _loaded_mtime) and _rebuild_lock.acquire(blocking=False):
+        if _index is None:
+            _refresh(stale)                # nothing to serve yet: build before matching
+        else:
+            threading.Thread(target=_refresh, args=(stale,), daemon=True).start()
+    return _index
+
+
+def find_names(text: str) -> List[Tuple[int, int]]:
+    index = get_index()
+    return index.find_spans(text) if index else []
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        sys.exit("usage: python -m backend.name_matcher build [names.txt] [names.idx.npy]")
+    args = [Path(a) for a in sys.argv[2:4]]
+    compile_names(*args)
+    print(f"Compiled {args[0] if args else NAMES_FILE} → {args[1] if len(args) > 1 else NAMES_INDEX}")
@@ -1,6 +1,9 @@
 # backend/pii_redactor.py
 import re
 
+from backend.audit_log import log_event
+from backend.name_matcher import find_names
+
 # ─────────────────────────────────────────────
 # Precompiled PII Regex Patterns
 # ─────────────────────────────────────────────
@@ -8,13 +11,28 @@ EMAIL_RE   = re.compile(r'\b[\w\.-]+?@\w+?\.\w+?\b', re.I)
 CARD_RE    = re.compile(r'\b(?:\d[ -]*?){13,16}\b')
 PHONE_RE   = re.compile(r'\b(?:\+?\d{1,3}[- ]?)?\d{10}\b')
 NUMBER_RE  = re.compile(r'\b\d{6,}\b')         # 6+ digits (generic IDs)
-NAME_RE    = re.compile(r'\b(Rajat\s+Shinde)\b', re.I)  # Replace with known names
+
+# ─────────────────────────────────────────────
+# Known Names (dictionary from data/names.txt)
+# ─────────────────────────────────────────────
+def _sub_names(text: str, found: dict) -> str:
+    spans = find_names(text)
+    if not spans:
+        return text
+    found['NAME'] = [text[a:b] for a, b in spans]
+    parts, pos = [], 0
+    for a, b in spans:
+        parts.append(text[pos:a])
+        parts.append('[NAME]')
+        pos = b
+    parts.append(text[pos:])
+    return ''.join(parts)
 
 # ─────────────────────────────────────────────
 # Redaction Utility
 # ─────────────────────────────────────────────
-def redact(text: str) -> str:
-    """Redacts common PII patterns and logs what was replaced."""
+def redact(text: str, audit: bool = True) -> str:
+    """Redacts common PII patterns and audits which kinds were replaced."""
     found = {}
 
     def _sub(pattern, label):
@@ -27,8 +45,131 @@ def redact(text: str) -> str:
     text = _sub(CARD_RE,   'CARD')
     text = _sub(PHONE_RE,  'PHONE')
     text = _sub(NUMBER_RE, 'NUMBER')
-    text = _sub(NAME_RE,   'NAME')
+    text = _sub_names(text, found)
 
-    if found:
-        print("🔐 Redacted PII →", found)   # Appears in uvicorn logs
+    if found and audit:
+        # Labels and counts only – the audit log must not hold the PII itself
+        log_event("pii_redacted", counts={k: len(v) for k, v in found.items()})
     return text
+
+# ─────────────────────────────────────────────
+# Streaming Redaction (PII split across chunks)
+# ─────────────────────────────────────────────
+HOLD_WORDS = 2            # last words held back – a name/email may still grow
+                          # (covers names up to MAX_NAME_WORDS = 3)
+MAX_TAIL = 256            # hard bound on held-back text per call
+PATTERNS = (EMAIL_RE, CARD_RE, PHONE_RE, NUMBER_RE)
+WORD_RE = re.compile(r'\S+')
+TRAILING_DIGITS_RE = re.compile(r'\+?\d[\d -]*$')
+DIGIT_RUN_RE = re.compile(r'\+?\d(?:[\d -]*\d)?')      # any (partial) number
+PARTIAL_EMAIL_RE = re.compile(r'\S*@\S*')
+
+
+class StreamRedactor:
+    """Redacts one call's text stream while carrying a short unreleased tail.
+
+    Each feed() only re-scans tail + chunk, so work is O(chunk), and text is
+    released once no PII match could still extend into it. Every chunk is
+    one turn; a turn is handed out only once all of its text is released.
+    """
+
+    def __init__(self):
+        self._tail = ""
+        self._ends = []       # chunk (turn) end offsets inside _tail
+        self._turn = ""       # released, redacted start of the open turn
+
+    @staticmethod
+    def _spans(buf: str):
+        return [m.span() for p in PATTERNS for m in p.finditer(buf)] + find_names(buf)
+
+    @classmethod
+    def _safe_cut(cls, buf: str) -> int:
+        words = [m.start() for m in WORD_RE.finditer(buf)]
+        cut = words[-HOLD_WORDS] if len(words) >= HOLD_WORDS else 0
+
+        digits = TRAILING_DIGITS_RE.search(buf)      # card/phone still being read
+        if digits:
+            cut = min(cut, digits.start())
+
+        # Never release half of a match that is already visible
+        spans = sorted(cls._spans(buf), reverse=True)
+        for start, end in spans:
+            if start < cut < end:
+                cut = start
+        return max(cut, len(buf) - MAX_TAIL)
+
+    def _separator(self, chunk: str) -> str:
+        """"" when tail + chunk only makes sense glued (e.g. "john.doe@exa" +
+        "mple.com"), otherwise a space so words of two turns don't merge."""
+        tail = self._tail
+        if not tail or tail[-1].isspace() or not chunk or chunk[0].isspace():
+            return ""
+        glued, edge = tail + chunk, len(tail)
+        if any(a < edge < b for p in PATTERNS for a, b in (m.span() for m in p.finditer(glued))):
+            return ""
+        return " "
+
+    def _release(self, text: str, ends) -> list:
+        turns, pos = [], 0
+        for end in ends:
+            turns.append((self._turn + redact(text[pos:end])).strip())
+            self._turn, pos = "", end
+        self._turn += redact(text[pos:])
+        return [t for t in turns if t]
+
+    def feed(self, chunk: str) -> list:
+        """Adds one chunk; returns the redacted turns completed by it (may be empty)."""
+        sep = self._separator(chunk)
+        if not sep and self._ends and self._ends[-1] == len(self._tail):
+            self._ends.pop()                        # glued: both chunks form one turn
+        buf = self._tail + sep + chunk
+        spans = self._spans(buf)
+        ends = [e for e in self._ends + [len(buf)]
+                if not any(a < e < b for a, b in spans)]   # a turn never splits a match
+
+        cut = self._safe_cut(buf)
+        self._tail = buf[cut:]
+        self._ends = [e - cut for e in ends if e > cut]
+        return self._release(buf[:cut], [e for e in ends if e <= cut]) if cut else []
+
+    @staticmethod
+    def _mask_pending(tail: str) -> str:
+        """Conservative view of unreleased text: a partial card, email or
+        name here would slip past redact(), so digit runs, anything with an
+        "@" and the last HOLD_WORDS words are masked outright."""
+        text = redact(tail, audit=False)
+        words = [m.start() for m in WORD_RE.finditer(text)]
+        if words:
+            text = text[:words[-min(HOLD_WORDS, len(words))]] + "[…]"
+        text = PARTIAL_EMAIL_RE.sub("[EMAIL]", text)
+        return DIGIT_RUN_RE.sub("[NUMBER]", text)
+
+    def peek(self) -> str:
+        """Masked view of the unfinished turn, without releasing it."""
+        return (self._turn + (self._mask_pending(self._tail) if self._tail else "")).strip()
+
+    def flush(self) -> list:
+        """Releases the held-back tail; returns the remaining turns."""
+        tail, ends = self._tail, self._ends
+        self._tail, self._ends = "", []
+        return self._release(tail, [e for e in ends if e < len(tail)] + [len(tail)])
+
+
+_STREAMS = {}
+
+
+def stream_for(call_id: str) -> StreamRedactor:
+    if call_id not in _STREAMS:
+        _STREAMS[call_id] = StreamRedactor()
+    return _STREAMS[call_id]
+
+
+def pending_text(call_id: str) -> str:
+    stream = _STREAMS.get(call_id)
+    return stream.peek() if stream else ""
+
+
+def close_stream(call_id: str) -> list:
+    """Releases whatever the call still holds back and forgets the call."""
+    stream = _STREAMS.pop(call_id, None)
+    return stream.flush() if stream else []
@@ -0,0 +1,157 @@
+# ──────────────────────────────────────────────
+# ⏯️ replay.py – Time-accurate trace replay
+# ──────────────────────────────────────────────
+# Re-drives a trace captured by backend/trace.py against a running backend:
+#     python -m backend.replay requests.jsonl --url http://localhost:8000
+#     python -m backend.replay requests.jsonl --speed 10      # 10× faster
+#     python -m backend.replay requests.jsonl --speed max     # no pacing
+# Prints per-endpoint latency percentiles, status codes and how many
+# responses differ from the recorded ones.
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+
+# Response fields that legitimately change between runs
+VOLATILE_FIELDS = {"latency_ms", "confidence"}
+
+
+def load_trace(path: Path) -> List[dict]:
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        rec = json.loads(line)
+        if "path" in rec and "ts" in rec:        # skip non-trace lines
+            records.append(rec)
+    records.sort(key=lambda r: r["ts"])
+    return records
+
+
+def diff_response(expected, actual) -> Optional[dict]:
+    """Field-level differences, ignoring VOLATILE_FIELDS; None if equal."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        keys = (expected.keys() | actual.keys()) - VOLATILE_FIELDS
+        changed = {k: (expected.get(k), actual.get(k)) for k in keys if expected.get(k) != actual.get(k)}
+        return changed or None
+    return None if expected == actual else {"body": (expected, actual)}
+
+
+class Replayer:
+    def __init__(self, base_url: str, speed: Optional[float], concurrency: int, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.speed = speed                     # None → as fast as possible
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+        self.session = requests.Session()
+        self.session.mount("http", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+        self.results: List[dict] = []
+        self._lock = threading.Lock()
+
+    def _send(self, rec: dict, scheduled: Optional[float]):
+        # Paced runs time from when the request was due, not when a worker got
+        # to it, so server backlog shows up instead of being hidden
+        # (coordinated omission). With --speed max there is no schedule, and
+        # queueing in our own pool is not server latency: time from here.
+        start = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            resp = self.session.request(
+                rec.get("method", "POST"), self.base_url + rec["path"],
+                params=rec.get("params") or None, json=rec.get("body"), timeout=self.timeout,
+            )
+            status = resp.status_code
+            try:
+                body = resp.json()
+            except ValueError:
+                body = resp.text
+        except requests.RequestException as e:
+            status, body = 0, str(e)
+        latency = (time.perf_counter() - start) * 1000
+
+        result = {
+            "path": rec["path"],
+            "status": status,
+            "latency_ms": latency,
+            "diff": diff_response(rec.get("response"), body) if status == rec.get("status") else {"status": (rec.get("status"), status)},
+        }
+        with self._lock:
+            self.results.append(result)
+
+    def run(self, records: List[dict]):
+        if not records:
+            return
+        t0_trace = records[0]["ts"]
+        t0 = time.perf_counter()
+        futures = []
+        for rec in records:
+            if self.speed:
+                scheduled = t0 + (rec["ts"] - t0_trace) / self.speed
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled = None
+            futures.append(self.pool.submit(self._send, rec, scheduled))
+        for f in futures:
+            f.result()
+        self.pool.shutdown()
+
+    def report(self) -> Dict[str, dict]:
+        by_path = defaultdict(list)
+        for r in self.results:
+            by_path[r["path"]].append(r)
+
+        report = {}
+        for path, rows in sorted(by_path.items()):
+            lat = np.array([r["latency_ms"] for r in rows])
+            p50, p90, p99 = np.percentile(lat, [50, 90, 99])
+            report[path] = {
+                "count": len(rows),
+                "p50_ms": round(float(p50), 1),
+                "p90_ms": round(float(p90), 1),
+                "p99_ms": round(float(p99), 1),
+                "max_ms": round(float(lat.max()), 1),
+                "status": dict(Counter(r["status"] for r in rows)),
+                "diffs": sum(1 for r in rows if r["diff"]),
+            }
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a CallMate request trace")
+    parser.add_argument("trace", type=Path)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--speed", default="1", help="time multiplier (1, 10, …) or 'max'")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--show-diffs", type=int, default=5, help="print up to N differing responses")
+    args = parser.parse_args(argv)
+
+    speed = None if args.speed == "max" else float(args.speed)
+    records = load_trace(args.trace)
+    if not records:
+        sys.exit(f"No trace records in {args.trace}")
+
+    replayer = Replayer(args.url, speed, args.concurrency, args.timeout)
+    start = time.perf_counter()
+    replayer.run(records)
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {len(records)} requests in {elapsed:.1f}s (speed={args.speed})")
+    for path, stats in replayer.report().items():
+        print(f"  {path:<12} {json.dumps(stats, ensure_ascii=False)}")
+    for r in [r for r in replayer.results if r["diff"]][:args.show_diffs]:
+        print(f"  diff {r['path']}: {json.dumps(r['diff'], ensure_ascii=False)[:300]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# ──────────────────────────────────────────────
+# 🙂 sentiment_model.py – Hashed n-gram linear sentiment classifier
+# ──────────────────────────────────────────────
+# Train offline from human-labelled utterances:
+#     python -m backend.sentiment_model export > to_label.jsonl
+#     (fill in each row's "label")
+#     python -m backend.sentiment_model train --labels to_label.jsonl
+# `export` dumps archived call utterances and feedback texts that have no
+# label yet. Weights are one float32 .npy of shape (dim + 1, 3) (last row =
+# bias), loaded memory-mapped so workers share pages and startup stays instant.
+#
+# Label sources (keyword-rule output is never used as a label):
+#   1. --labels JSONL rows {"text": ..., "label": "negative|neutral|positive"}
+#   2. feedback entries carrying an agent-confirmed "sentiment" field
+# Training needs MIN_PER_CLASS examples per label, and a model is only
+# saved if it beats the keyword rules on a held-out split.
+
+import argparse
+import json
+import os
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.archive import iter_records
+from backend.text_features import hashed_counts, ngrams, tokenize
+
+LABELS = ("negative", "neutral", "positive")
+HASH_DIM = 1 << 14
+MODEL_PATH = Path(os.getenv("CALLMATE_SENTIMENT_MODEL", "models/sentiment.npy"))
+MIN_PER_CLASS = 20
+HOLDOUT = 0.2
+
+NEGATIVE_KW = ("not happy", "bad", "worst", "angry", "refund")
+POSITIVE_KW = ("great", "awesome", "thank you", "love")
+
+
+def keyword_label(text: str) -> str:
+    """Legacy keyword rules; used as fallback and as weak supervision."""
+    tl = text.lower()
+    if any(kw in tl for kw in NEGATIVE_KW):
+        return "negative"
+    if any(kw in tl for kw in POSITIVE_KW):
+        return "positive"
+    return "neutral"
+
+
+# ─────────────────────────────────────────────
+# Features
+# ─────────────────────────────────────────────
+def sparse_features(texts: List[str], dim: int = HASH_DIM) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(row, column, value) triplets of L2-normalised log term counts."""
+    rows, cols, vals = [], [], []
+    for row, text in enumerate(texts):
+        idx, counts = hashed_counts(ngrams(tokenize(text)), dim)
+        v = np.log1p(counts)
+        rows.append(np.full(len(idx), row, dtype=np.int64))
+        cols.append(idx)
+        vals.append(v / (np.sqrt((v * v).sum()) + 1e-9))
+    if not rows:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(vals).astype(np.float32)
+
+
+def vectorize(texts: List[str], dim: int = HASH_DIM) -> np.ndarray:
+    """Dense (len(texts), dim) matrix; only used for fixed-size training batches."""
+    X = np.zeros((len(texts), dim), dtype=np.float32)
+    rows, cols, vals = sparse_features(texts, dim)
+    X[rows, cols] = vals
+    return X
+
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+# ─────────────────────────────────────────────
+# Inference
+# ─────────────────────────────────────────────
+@lru_cache
+def load_model() -> Optional[np.ndarray]:
+    if not MODEL_PATH.exists():
+        return None
+    return np.load(MODEL_PATH, mmap_mode="r")
+
+
+def _logits(texts: List[str], W: np.ndarray) -> np.ndarray:
+    rows, cols, vals = sparse_features(texts, W.shape[0] - 1)
+    contrib = W[cols] * vals[:, None]
+    return np.stack([np.bincount(rows, weights=contrib[:, c], minlength=len(texts))
+                     for c in range(W.shape[1])], axis=1) + W[-1]
+
+
+def predict_batch(texts: List[str]) -> List[Tuple[str, float]]:
+    """Scores all `texts` in one pass over their non-zero features.
+
+    Only the weight rows of features that occur are gathered, so memory
+    grows with the number of tokens, not len(texts) × dim.
+    """
+    if not texts:
+        return []
+    W = load_model()
+    if W is None:
+        return [(keyword_label(t), 0.5) for t in texts]
+
+    probs = _softmax(_logits(texts, W))
+    best = probs.argmax(axis=1)
+    return [(LABELS[b], round(float(probs[i, b]), 2)) for i, b in enumerate(best)]
+
+
+# ─────────────────────────────────────────────
+# Offline training
+# ─────────────────────────────────────────────
+def _feedback_rows() -> Iterable[dict]:
+    path = Path("feedback.json")
+    if path.exists():
+        yield from json.loads(path.read_text())
+    db = Path("feedback.db")
+    if db.exists():
+        with sqlite3.connect(db) as conn:
+            for (text,) in conn.execute("SELECT text FROM feedback"):
+                yield {"text": text}
+
+
+def collect_examples(labels_file: Optional[Path] = None) -> List[Tuple[str, str]]:
+    examples, seen = [], set()
+
+    def _add(text, label):
+        if text and label in LABELS and text not in seen:
+            seen.add(text)
+            examples.append((text, label))
+
+    if labels_file and labels_file.exists():
+        for line in labels_file.read_text().splitlines():
+            if line.strip():
+                row = json.loads(line)
+                _add(row.get("text"), row.get("label"))
+    for row in _feedback_rows():
+        _add(row.get("text"), row.get("sentiment"))
+    return examples
+
+
+def unlabeled_texts(labelled: Iterable[str] = ()) -> List[str]:
+    """Archived utterances and feedback texts without a label, for annotation."""
+    seen, texts = set(labelled), []
+    candidates = (u for rec in iter_records() for u in rec.get("utterances", []))
+    for text in list(candidates) + [r.get("text") for r in _feedback_rows()]:
+        if text and text not in seen:
+            seen.add(text)
+            texts.append(text)
+    return texts
+
+
+def check_counts(examples: List[Tuple[str, str]], minimum: int = MIN_PER_CLASS):
+    counts = {label: 0 for label in LABELS}
+    for _, label in examples:
+        counts[label] += 1
+    short = {l: n for l, n in counts.items() if n < minimum}
+    if short:
+        raise ValueError(f"Need at least {minimum} labelled examples per class, have {counts}")
+    return counts
+
+
+def accuracy(examples: List[Tuple[str, str]], W: Optional[np.ndarray]) -> float:
+    """Share of `examples` labelled correctly by `W` (or the keyword rules if None)."""
+    texts = [t for t, _ in examples]
+    if W is None:
+        predicted = [keyword_label(t) for t in texts]
+    else:
+        predicted = [LABELS[i] for i in _logits(texts, W).argmax(axis=1)]
+    return float(np.mean([p == label for p, (_, label) in zip(predicted, examples)]))
+
+
+def split(examples: List[Tuple[str, str]], holdout: float = HOLDOUT, seed: int = 0):
+    """Per-class random (train, test) split."""
+    rng = np.random.default_rng(seed)
+    train_set, test_set = [], []
+    for label in LABELS:
+        rows = [e for e in examples if e[1] == label]
+        order = rng.permutation(len(rows))
+        n_test = max(1, int(len(rows) * holdout))
+        test_set += [rows[i] for i in order[:n_test]]
+        train_set += [rows[i] for i in order[n_test:]]
+    return train_set, test_set
+
+
+def train(examples: List[Tuple[str, str]], dim: int = HASH_DIM, epochs: int = 30,
+          lr: float = 0.5, l2: float = 1e-4, batch_size: int = 256, seed: int = 0) -> np.ndarray:
+    """Multinomial logistic regression with mini-batch gradient descent."""
+    rng = np.random.default_rng(seed)
+    texts = [t for t, _ in examples]
+    y = np.array([LABELS.index(l) for _, l in examples])
+    W = np.zeros((dim + 1, len(LABELS)), dtype=np.float32)
+
+    for _ in range(epochs):
+        order = rng.permutation(len(texts))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            X = vectorize([texts[i] for i in batch], dim)
+            probs = _softmax(X @ W[:-1] + W[-1])
+            probs[np.arange(len(batch)), y[batch]] -= 1.0
+            probs /= len(batch)
+            W[:-1] -= lr * (X.T @ probs + l2 * W[:-1])
+            W[-1] -= lr * probs.sum(axis=0)
+    return W
+
+
+def save_model(W: np.ndarray, path: Optional[Path] = None):
+    path = path or MODEL_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp.npy")
+    np.save(tmp, W.astype(np.float32))
+    os.replace(tmp, path)
+    load_model.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the CallMate sentiment model")
+    parser.add_argument("command", choices=["train", "export"])
+    parser.add_argument("--labels", type=Path, help="JSONL of {text, label}")
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--min-per-class", type=int, default=MIN_PER_CLASS)
+    args = parser.parse_args()
+
+    examples = collect_examples(args.labels)
+    if args.command == "export":
+        for text in unlabeled_texts(t for t, _ in examples):
+            print(json.dumps({"text": text, "label": ""}, ensure_ascii=False))
+        return
+
+    try:
+        counts = check_counts(examples, args.min_per_class)
+    except ValueError as e:
+        raise SystemExit(f"{e}. Label more with `export` first.")
+
+    train_set, test_set = split(examples)
+    model_acc = accuracy(test_set, train(train_set, epochs=args.epochs))
+    rules_acc = accuracy(test_set, None)
+    print(f"Held-out accuracy on {len(test_set)} examples: model {model_acc:.3f}, keyword rules {rules_acc:.3f}")
+    if model_acc <= rules_acc:
+        raise SystemExit("Model does not beat the keyword rules; not saved.")
+
+    save_model(train(examples, epochs=args.epochs))
+    print(f"Trained on {len(examples)} examples {counts} → {MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    main()
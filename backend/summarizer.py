@@ -0,0 +1,166 @@
+# ──────────────────────────────────────────────
+# 📝 summarizer.py – Incremental extractive call summaries
+# ──────────────────────────────────────────────
+# Keeps the full redacted transcript per call_id and a sparse hashed
+# term-frequency row per sentence (CSR-style: indptr / indices / data).
+# Document frequencies are updated as turns arrive, so a summary only costs
+# one TF-IDF weighting + two bincounts over the non-zeros.
+#
+# Calls idle for IDLE_TTL_S are reported by idle_calls(); the backend ends
+# and archives them like an explicit end of call.
+
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.text_features import hashed_counts, split_sentences, tokenize
+
+HASH_DIM = 2048          # hashed vocabulary size
+TOP_K = 3                # sentences per summary
+MAX_TURNS = 5000         # hard cap per call to bound memory (extra turns are counted)
+REDUNDANCY = 0.8         # cosine above which a sentence counts as a repeat
+IDLE_TTL_S = 2 * 3600    # calls without a chunk for this long count as ended
+RECENT_CHUNKS = 64       # chunk ids remembered per call to spot client retries
+
+
+class CallTranscript:
+    """Full transcript of one call plus its sentence/term matrix."""
+
+    def __init__(self, dim: int = HASH_DIM):
+        self.dim = dim
+        self.turns: List[str] = []
+        self.sentences: List[str] = []
+        self._indptr: List[int] = [0]
+        self._indices = np.zeros(256, dtype=np.int32)
+        self._data = np.zeros(256, dtype=np.float32)
+        self._df = np.zeros(dim, dtype=np.float32)
+        self._cache: Dict[int, Tuple[Tuple[int, int], str]] = {}   # k → ((turns, sentences), summary)
+        self.dropped = 0                                # turns past MAX_TURNS
+        self.recent_chunks = deque(maxlen=RECENT_CHUNKS)  # client chunk ids, for resends
+        self.last_seen = time.monotonic()
+
+    def add_turn(self, text: str):
+        self.last_seen = time.monotonic()
+        if len(self.turns) >= MAX_TURNS:
+            self.dropped += 1
+            return
+        self.turns.append(text)
+        for sentence in split_sentences(text):
+            idx, counts = hashed_counts(tokenize(sentence, drop_stopwords=True), self.dim)
+            if not len(idx):
+                continue
+            start = self._indptr[-1]
+            end = start + len(idx)
+            if end > len(self._indices):
+                size = max(end, 2 * len(self._indices))
+                self._indices = np.resize(self._indices, size)
+                self._data = np.resize(self._data, size)
+            self._indices[start:end] = idx
+            self._data[start:end] = 1.0 + np.log(counts)   # sublinear tf
+            self._indptr.append(end)
+            self._df[idx] += 1.0
+            self.sentences.append(sentence)
+
+    def top_sentences(self, k: int = TOP_K) -> List[str]:
+        n = len(self.sentences)
+        if n <= k:
+            return list(self.sentences)
+
+        nnz = self._indptr[-1]
+        indptr = np.asarray(self._indptr)
+        indices = self._indices[:nnz]
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+
+        idf = np.log((1.0 + n) / (1.0 + self._df)) + 1.0
+        values = self._data[:nnz] * idf[indices]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n))
+        values /= norms[rows] + 1e-9
+
+        # Centrality: cosine similarity of each sentence to the call centroid
+        centroid = np.bincount(indices, weights=values, minlength=self.dim)
+        scores = np.bincount(rows, weights=values * centroid[indices], minlength=n)
+
+        # Greedy pick in score order, skipping near-duplicates of earlier picks;
+        # only the (≤ k) picked rows are ever densified
+        chosen: List[int] = []
+        picked = np.zeros((k, self.dim), dtype=np.float32)
+        for i in np.argsort(-scores):
+            a, b = indptr[i], indptr[i + 1]
+            if chosen and (picked[:len(chosen), indices[a:b]] @ values[a:b]).max() > REDUNDANCY:
+                continue
+            picked[len(chosen), indices[a:b]] = values[a:b]
+            chosen.append(int(i))
+            if len(chosen) == k:
+                break
+        return [self.sentences[i] for i in sorted(chosen)]
+
+    def summary(self, k: int = TOP_K) -> str:
+        key = (len(self.turns), len(self.sentences))
+        cached = self._cache.get(k)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        if not self.turns:
+            text = "No conversation to summarise."
+        else:
+            points = " ".join(f"“{s}”" for s in self.top_sentences(k))
+            text = f"Key points: {points} Total turns: {len(self.turns)}."
+        self._cache[k] = (key, text)
+        return text
+
+
+_TRANSCRIPTS: Dict[str, CallTranscript] = {}
+
+
+def touch(call_id: str) -> CallTranscript:
+    """Marks the call active (creating its transcript) without adding a turn."""
+    t = _TRANSCRIPTS.get(call_id)
+    if t is None:
+        t = _TRANSCRIPTS[call_id] = CallTranscript()
+    t.last_seen = time.monotonic()
+    return t
+
+
+def first_delivery(call_id: str, chunk_id: Optional[str]) -> bool:
+    """False if `chunk_id` was already seen for this call (a client retry)."""
+    t = touch(call_id)
+    if chunk_id is None:
+        return True
+    if chunk_id in t.recent_chunks:
+        return False
+    t.recent_chunks.append(chunk_id)
+    return True
+
+
+def add_turn(call_id: str, text: str):
+    touch(call_id).add_turn(text)
+
+
+def has_call(call_id: str) -> bool:
+    return call_id in _TRANSCRIPTS
+
+
+def idle_calls(ttl: float = IDLE_TTL_S) -> List[str]:
+    now = time.monotonic()
+    return [c for c, t in _TRANSCRIPTS.items() if now - t.last_seen > ttl]
+
+
+def dropped_turns(call_id: str) -> int:
+    t = _TRANSCRIPTS.get(call_id)
+    return t.dropped if t else 0
+
+
+def get_transcript(call_id: str) -> List[str]:
+    t = _TRANSCRIPTS.get(call_id)
+    return list(t.turns) if t else []
+
+
+def summarize(call_id: str, k: int = TOP_K) -> str:
+    t = _TRANSCRIPTS.get(call_id)
+    return t.summary(k) if t else "No conversation to summarise."
+
+
+def drop_call(call_id: str):
+    _TRANSCRIPTS.pop(call_id, None)
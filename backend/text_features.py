@@ -0,0 +1,53 @@
+# ──────────────────────────────────────────────
+# 🔤 text_features.py – Shared tokenizing & feature hashing
+# ──────────────────────────────────────────────
+# Used by the summarizer, the knowledge index and the sentiment model so all
+# three agree on tokens and hashed feature slots. crc32 keeps hashes stable
+# across processes, which matters for anything serialized to disk.
+
+import re
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+SENTENCE_RE = re.compile(r"[^.!?]+[.!?]*")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by do for from has have i if in is it its me my
+of on or so that the this to was we were will with you your our us he she they
+them their there then than just can could would should am im
+""".split())
+
+
+def tokenize(text: str, drop_stopwords: bool = False) -> List[str]:
+    tokens = TOKEN_RE.findall(text.lower())
+    if drop_stopwords:
+        tokens = [t for t in tokens if t not in STOPWORDS]
+    return tokens
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in SENTENCE_RE.findall(text) if s.strip()]
+
+
+def ngrams(tokens: List[str], n: int = 2) -> List[str]:
+    """Unigrams plus joined n-grams up to `n` (e.g. "not happy")."""
+    grams = list(tokens)
+    for size in range(2, n + 1):
+        grams.extend(" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+    return grams
+
+
+def hash_token(token: str, dim: int) -> int:
+    return zlib.crc32(token.encode("utf-8")) % dim
+
+
+def hashed_counts(tokens: List[str], dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (unique slot indices, counts) for `tokens` hashed into `dim` slots."""
+    if not tokens:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    slots = np.fromiter((hash_token(t, dim) for t in tokens), dtype=np.int64, count=len(tokens))
+    idx, counts = np.unique(slots, return_counts=True)
+    return idx, counts.astype(np.float32)
@@ -0,0 +1,97 @@
+# ──────────────────────────────────────────────
+# 🎞️ trace.py – Request capture for load replay
+# ──────────────────────────────────────────────
+# Enable with CALLMATE_TRACE=1. Every traced request is appended to
+# CALLMATE_TRACE_FILE (default requests.jsonl) as one JSON line:
+#     {"request_id", "ts", "method", "path", "params", "body",
+#      "status", "response", "latency_ms"}
+# Lines go through the audit log's background JsonlWriter, so capture
+# never blocks the event loop. Replay with `python -m backend.replay`.
+#
+# "text" fields of recorded bodies are PII-redacted. Capturing them raw
+# needs an explicit CALLMATE_TRACE_RAW=1 (local debugging only).
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+from backend.audit_log import JsonlWriter
+from backend.pii_redactor import redact
+
+TRACE_ENABLED = os.getenv("CALLMATE_TRACE", "").lower() in ("1", "true", "yes")
+TRACE_FILE = Path(os.getenv("CALLMATE_TRACE_FILE", "requests.jsonl"))
+TRACE_RAW = os.getenv("CALLMATE_TRACE_RAW", "").lower() in ("1", "true", "yes")
+TRACED_PATHS = ("/suggest", "/feedback", "/consent")
+
+
+def _decode(raw: bytes):
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw.decode("utf-8", "replace")
+
+
+def _scrub(body):
+    if TRACE_RAW:
+        return body
+    if isinstance(body, dict):
+        return {k: redact(v, audit=False) if k == "text" and isinstance(v, str) else v
+                for k, v in body.items()}
+    if isinstance(body, str):
+        return redact(body, audit=False)
+    return body
+
+
+class TraceMiddleware:
+    """Pure ASGI middleware: tees request and response bodies for traced paths."""
+
+    def __init__(self, app, writer: JsonlWriter):
+        self.app = app
+        self.writer = writer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in TRACED_PATHS:
+            return await self.app(scope, receive, send)
+
+        ts = time.time()
+        start = time.perf_counter()
+        req_body, resp_body, status = [], [], [0]
+
+        async def _receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                req_body.append(message.get("body", b""))
+            return message
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                resp_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, _receive, _send)
+        finally:
+            self.writer.write({
+                "request_id": uuid.uuid4().hex,
+                "ts": ts,
+                "method": scope["method"],
+                "path": scope["path"],
+                "params": dict(parse_qsl(scope.get("query_string", b"").decode())),
+                "body": _scrub(_decode(b"".join(req_body))),
+                "status": status[0],
+                "response": _decode(b"".join(resp_body)),
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            })
+
+
+def install(app):
+    """Adds capture to `app` when CALLMATE_TRACE is set."""
+    if TRACE_ENABLED:
+        app.add_middleware(TraceMiddleware, writer=JsonlWriter(TRACE_FILE))
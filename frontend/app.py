@@ -1,5 +1,6 @@
 import streamlit as st
-import requests, queue, tempfile, av, uuid, os
+import requests, queue, tempfile, av, uuid, os, json, threading, time
+from collections import deque
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from streamlit_webrtc import webrtc_streamer, WebRtcMode
@@ -7,14 +8,6 @@ import speech_recognition as sr
 from pydub import AudioSegment
 import pandas as pd
 
-# ✅ Import (or safely fallback) for auto-refresh
-try:
-    from streamlit_autorefresh import st_autorefresh
-except Exception:
-    def st_autorefresh(*args, **kwargs):
-        # No-op if the optional package isn't installed
-        pass
-
 # OPTIONAL: remove if unused
 # import altair as alt
 
@@ -55,19 +48,23 @@ st.markdown(
 # ─────────────────────────────────────────────────────────────
 # 3️⃣ Robust network helpers (Session, retries, caching, fallbacks)
 # ─────────────────────────────────────────────────────────────
+@st.cache_resource
 def _make_session():
+    # One pooled HTTP session per server process, shared by every UI session
     retries = Retry(
         total=4,                    # 1 try + 3 retries
         connect=2,                  # connection-level retries
         read=3,                     # read-level retries
         backoff_factor=0.6,         # exponential backoff (0.6, 1.2, 2.4, ...)
-        status_forcelist=[502, 503, 504],
+        status_forcelist=[429, 502, 503, 504],   # 429: /suggest sheds load
         allowed_methods={"GET", "POST"},
+        respect_retry_after_header=True,
         raise_on_status=False,
     )
     adapter = HTTPAdapter(max_retries=retries, pool_connections=20, pool_maxsize=50)
     s = requests.Session()
     s.mount("https://", adapter)
+    s.mount("http://", adapter)
     s.headers.update({"Accept": "application/json", "User-Agent": "CallMate-Dashboard/1.0"})
     return s
 
@@ -99,15 +96,69 @@ def post_json(path: str, *, json=None, params=None, connect_timeout=3, read_time
         return default if default is not None else {"_error": str(e)}
 
 @st.cache_data(ttl=30)
-def get_json_cached(path: str, *, params=None):
-    # Cached wrapper for GETs used by dashboard
+def get_json_cached(path: str, *, params=None, version: int = 0):
+    # Cached wrapper for GETs used by dashboard; a new `version` forces a refetch
     return get_json(path, params=params)
 
+@st.cache_data(ttl=15, show_spinner=False)
 def health_check() -> bool:
     # If you have a /healthz endpoint, use it. Otherwise, a quick HEAD/GET to an inexpensive endpoint.
     result = get_json("/feedback/summary", connect_timeout=2, read_timeout=6, default={"_error": "x"})
     return "_error" not in result
 
+# ─────────────────────────────────────────────────────────────
+# 3️⃣b Live events (one SSE connection per Streamlit server)
+#     Viewers read this in-memory state instead of polling the backend;
+#     cached fetches are only invalidated when an event says data changed.
+# ─────────────────────────────────────────────────────────────
+class EventListener:
+    def __init__(self):
+        self.connected = False
+        self.feedback_version = 0
+        self.escalation_version = 0
+        self.escalations = deque(maxlen=20)
+        self.latencies = deque(maxlen=200)
+        threading.Thread(target=self._run, name="callmate-events", daemon=True).start()
+
+    def _handle(self, event: str, data: dict):
+        if event == "feedback":
+            self.feedback_version += 1
+        elif event == "escalation":
+            self.escalations.appendleft(data)
+            self.escalation_version += 1
+        elif event == "latency":
+            self.latencies.append(data.get("latency_ms", 0))
+        elif event == "dropped":
+            # We missed events – treat everything as changed
+            self.feedback_version += 1
+            self.escalation_version += 1
+
+    def _run(self):
+        while True:
+            try:
+                with requests.get(
+                    _url("/events"), stream=True, timeout=(3, 60),
+                    headers={"Accept": "text/event-stream"},
+                ) as resp:
+                    resp.raise_for_status()
+                    self.connected = True
+                    event = None
+                    for line in resp.iter_lines(decode_unicode=True):
+                        if line.startswith("event:"):
+                            event = line[6:].strip()
+                        elif line.startswith("data:") and event:
+                            self._handle(event, json.loads(line[5:]))
+                        elif not line:
+                            event = None
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+            self.connected = False
+            time.sleep(5)  # backend down or redeploying – reconnect later
+
+@st.cache_resource
+def get_event_listener() -> EventListener:
+    return EventListener()
+
 # ─────────────────────────────────────────────────────────────
 # 4️⃣ Initialize Session State
 # ─────────────────────────────────────────────────────────────
@@ -135,7 +186,16 @@ if "audio_q" not in st.session_state:
     st.session_state.audio_q = queue.Queue()
 audio_q: queue.Queue = st.session_state.audio_q
 
-CALL_ID = "demo-" + uuid.uuid4().hex[:8]
+# Stable for the whole UI session; a new id is issued only after "End Call"
+if "call_id" not in st.session_state:
+    st.session_state.call_id = "demo-" + uuid.uuid4().hex[:8]
+
+def call_id() -> str:
+    return st.session_state.call_id
+
+@st.cache_resource
+def get_recognizer() -> sr.Recognizer:
+    return sr.Recognizer()
 
 # ─────────────────────────────────────────────────────────────
 # 5️⃣ Tabs (must be defined before use)
@@ -182,7 +242,7 @@ with tab_main:
     uploaded_file = st.file_uploader("Upload and transcribe:", type=["wav"])
     if uploaded_file:
         with st.spinner("🧠 Transcribing…"):
-            rec = sr.Recognizer()
+            rec = get_recognizer()
             with sr.AudioFile(uploaded_file) as src:
                 audio_data = rec.record(src)
             try:
@@ -219,7 +279,7 @@ with tab_main:
                     with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_wav:
                         audio_seg.export(tmp_wav.name, format="wav")
                         wav_path = tmp_wav.name
-                    rec = sr.Recognizer()
+                    rec = get_recognizer()
                     with sr.AudioFile(wav_path) as src:
                         audio = rec.record(src)
                         try:
@@ -233,88 +293,101 @@ with tab_main:
 
     st.markdown("---")
 
-    st.markdown("### 🧾 Customer Statement & AI Suggestion")
-    text_input = st.text_input(
-        "💬 Customer says:",
-        value=st.session_state.voice_transcript or "",
-        max_chars=500,
-        placeholder="e.g., I still haven’t received my refund…"
-    )
+    # Fragment: typing, feedback and report clicks rerun only this panel,
+    # not the WebRTC widget or the dashboard
+    @st.fragment
+    def suggestion_panel():
+        st.markdown("### 🧾 Customer Statement & AI Suggestion")
+        text_input = st.text_input(
+            "💬 Customer says:",
+            value=st.session_state.voice_transcript or "",
+            max_chars=500,
+            placeholder="e.g., I still haven’t received my refund…"
+        )
 
-    if not st.session_state.consent_given:
-        st.warning("⚠️ Please tick the consent box to continue.")
+        if not st.session_state.consent_given:
+            st.warning("⚠️ Please tick the consent box to continue.")
 
-    if st.button("🔁 Get AI Suggestion", disabled=(not st.session_state.consent_given or len(text_input.strip()) == 0)):
-        try:
-            if not st.session_state.consent_sent:
-                post_json("/consent", params={"call_id": CALL_ID, "consent": True}, connect_timeout=3, read_timeout=8)
-                st.session_state.consent_sent = True
-            with st.spinner("💡 Thinking…"):
-                data = post_json("/suggest", json={"text": text_input, "call_id": CALL_ID}, connect_timeout=3, read_timeout=20)
-            if "_error" in data:
-                raise RuntimeError(data["_error"])
-            st.session_state.last_resp = data
-            sanitized = data.get("redacted_text", text_input)
-            st.session_state.last_input = sanitized
-            st.session_state.conversation.append(sanitized)
-            st.session_state.voice_transcript = ""
-            if "latency_ms" in data:
-                st.session_state.latency_list.append(data["latency_ms"])
-        except Exception as e:
-            st.error(f"❌ Error: {e}")
-
-    # 🧠 Output Response
-    data = st.session_state.last_resp
-    if data and "suggestion" in data:
-        st.success("💡 " + data["suggestion"])
-        sent = data.get("sentiment", "neutral")
-        col = {"positive": "green", "negative": "red"}.get(sent, "gray")
-        emo = {"positive": "😊", "neutral": "😐", "negative": "😠"}.get(sent, "😐")
-        st.markdown(f"**{emo} Sentiment:** <span style='color:{col}'>{sent.capitalize()}</span>", unsafe_allow_html=True)
-        if data.get("compliance") == "flagged":
-            st.warning("⚠️ Compliance Alert: sensitive terms detected")
-        else:
-            st.markdown("<span style='color:green'>✔ Compliance: clean</span>", unsafe_allow_html=True)
-        st.caption(f"⏱️ Latency: {data.get('latency_ms', 0)} ms")
-        if data.get("pii_redacted"):
-            st.markdown("🔐 _Sensitive data masked_")
-
-        # Feedback
-        st.markdown("### 🗣️ Was this suggestion helpful?")
-        fb1, fb2 = st.columns(2)
-        def send_fb(helpful: bool):
-            # Fire-and-forget; we don’t surface errors to users here
-            post_json("/feedback", json={"call_id": CALL_ID, "text": st.session_state.last_input, "helpful": helpful}, connect_timeout=3, read_timeout=8)
-        if fb1.button("👍 Yes"):
-            send_fb(True)
-            st.success("Thanks!")
-        if fb2.button("👎 No"):
-            send_fb(False)
-            st.warning("We’ll improve!")
-
-        if st.button("📁 End Call & Generate Report"):
-            rep = get_json("/summary/" + CALL_ID, connect_timeout=3, read_timeout=20, default={"_error": "unavailable"})
-            if "_error" in rep and st.session_state.last_good_session_report:
-                st.info("Showing last available report (backend slow).")
-                rep = st.session_state.last_good_session_report
-            elif "_error" not in rep:
-                st.session_state.last_good_session_report = rep
-
-            if "_error" not in rep:
-                st.markdown("## 📁 Post-Call Report")
-                st.write(rep.get("summary", ""))
-                st.markdown(
-                    f"**Overall sentiment:** {rep.get('sentiment_overall','N/A').capitalize()}   \n"
-                    f"**Compliance:** {rep.get('compliance_overall','N/A')}   \n"
-                    f"**Escalation:** {rep.get('escalation','N/A')}"
-                )
-                with st.expander("📒 Full conversation context"):
-                    for line in rep.get("utterances", []):
-                        st.write("•", line)
-                with st.expander("🧾 Full JSON Report View"):
-                    st.json(rep)
+        if st.button("🔁 Get AI Suggestion", disabled=(not st.session_state.consent_given or len(text_input.strip()) == 0)):
+            try:
+                if not st.session_state.consent_sent:
+                    post_json("/consent", params={"call_id": call_id(), "consent": True}, connect_timeout=3, read_timeout=8)
+                    st.session_state.consent_sent = True
+                with st.spinner("💡 Thinking…"):
+                    # chunk_id lets the backend drop retried copies of the same chunk
+                    chunk = {"text": text_input, "call_id": call_id(), "chunk_id": uuid.uuid4().hex}
+                    data = post_json("/suggest", json=chunk, connect_timeout=3, read_timeout=20)
+                if "_error" in data:
+                    raise RuntimeError(data["_error"])
+                st.session_state.last_resp = data
+                sanitized = data.get("redacted_text", text_input)
+                st.session_state.last_input = sanitized
+                st.session_state.conversation.append(sanitized)
+                st.session_state.voice_transcript = ""
+                if "latency_ms" in data:
+                    st.session_state.latency_list.append(data["latency_ms"])
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
+
+        # 🧠 Output Response
+        data = st.session_state.last_resp
+        if data and "suggestion" in data:
+            st.success("💡 " + data["suggestion"])
+            sent = data.get("sentiment", "neutral")
+            col = {"positive": "green", "negative": "red"}.get(sent, "gray")
+            emo = {"positive": "😊", "neutral": "😐", "negative": "😠"}.get(sent, "😐")
+            st.markdown(f"**{emo} Sentiment:** <span style='color:{col}'>{sent.capitalize()}</span>", unsafe_allow_html=True)
+            if data.get("compliance") == "flagged":
+                st.warning("⚠️ Compliance Alert: sensitive terms detected")
             else:
-                st.error("Could not fetch the report right now.")
+                st.markdown("<span style='color:green'>✔ Compliance: clean</span>", unsafe_allow_html=True)
+            st.caption(f"⏱️ Latency: {data.get('latency_ms', 0)} ms")
+            if data.get("pii_redacted"):
+                st.markdown("🔐 _Sensitive data masked_")
+
+            # Feedback
+            st.markdown("### 🗣️ Was this suggestion helpful?")
+            fb1, fb2 = st.columns(2)
+            def send_fb(helpful: bool):
+                # Fire-and-forget; we don’t surface errors to users here
+                post_json("/feedback", json={"call_id": call_id(), "text": st.session_state.last_input, "helpful": helpful}, connect_timeout=3, read_timeout=8)
+            if fb1.button("👍 Yes"):
+                send_fb(True)
+                st.success("Thanks!")
+            if fb2.button("👎 No"):
+                send_fb(False)
+                st.warning("We’ll improve!")
+
+            if st.button("📁 End Call & Generate Report"):
+                # Ends the call server-side: transcript is archived and the final report returned
+                rep = post_json(f"/calls/{call_id()}/end", connect_timeout=3, read_timeout=20, default={"_error": "unavailable"})
+                if "_error" in rep and st.session_state.last_good_session_report:
+                    st.info("Showing last available report (backend slow).")
+                    rep = st.session_state.last_good_session_report
+                elif "_error" not in rep:
+                    st.session_state.last_good_session_report = rep
+                    # Call is archived server-side; the next suggestion starts a new call
+                    st.session_state.call_id = "demo-" + uuid.uuid4().hex[:8]
+                    st.session_state.consent_sent = False
+                    st.session_state.conversation = []
+
+                if "_error" not in rep:
+                    st.markdown("## 📁 Post-Call Report")
+                    st.write(rep.get("summary", ""))
+                    st.markdown(
+                        f"**Overall sentiment:** {rep.get('sentiment_overall','N/A').capitalize()}   \n"
+                        f"**Compliance:** {rep.get('compliance_overall','N/A')}   \n"
+                        f"**Escalation:** {rep.get('escalation','N/A')}"
+                    )
+                    with st.expander("📒 Full conversation context"):
+                        for line in rep.get("utterances", []):
+                            st.write("•", line)
+                    with st.expander("🧾 Full JSON Report View"):
+                        st.json(rep)
+                else:
+                    st.error("Could not fetch the report right now.")
+
+    suggestion_panel()
 
 # ─────────────────────────────────────────────────────────────
 # 7️⃣ TAB 2 – Dashboard – Polished, Enhanced, and Visualized
@@ -323,114 +396,138 @@ with tab_dash:
     st.markdown("## 📊 CallMate AI – Live Dashboard")
     st.caption("Real-time insights & agent performance analytics")
 
-    # Optional: auto-refresh dashboard every 30s
-    auto = st.checkbox("Auto-refresh every 30s", value=True, help="Refreshes the dashboard data periodically")
-    if auto:
-        st_autorefresh(interval=30_000, key="dash_autorefresh")
-    else:
-        if st.button("↻ Refresh now"):
-            st.rerun()
-
-    backend_ok = health_check()
-    st.markdown(
-        f"**Backend status:** {'✅ Healthy' if backend_ok else '🟡 Degraded/Slow'}  \n"
-        f"<small>URL: {BACKEND_URL}</small>",
-        unsafe_allow_html=True
-    )
+    # Fragment: live updates rerun only the dashboard, never the whole app.
+    # A rerun reads pushed events from memory; the backend is only hit when
+    # an event bumped a version (or the 30s cache expired while offline).
+    auto = st.checkbox("Live updates", value=True, help="Pushes new feedback and escalations as they happen")
+    live = get_event_listener()
+
+    @st.fragment(run_every="2s" if auto else None)
+    def dashboard_panel():
+        if not auto:
+            st.button("↻ Refresh now")  # any click inside a fragment reruns just the fragment
+
+        backend_ok = health_check()
+        st.markdown(
+            f"**Backend status:** {'✅ Healthy' if backend_ok else '🟡 Degraded/Slow'} · "
+            f"{'🟢 Live' if live.connected else '⚪ Polling'}  \n"
+            f"<small>URL: {BACKEND_URL}</small>",
+            unsafe_allow_html=True
+        )
 
-    try:
-        # Feedback summary (cached)
-        summary = get_json_cached("/feedback/summary")
-        if "_error" in summary:
-            if st.session_state.last_good_summary:
-                st.info("Showing cached summary (backend slow).")
-                summary = st.session_state.last_good_summary
+        try:
+            # Feedback summary (cached)
+            summary = get_json_cached("/feedback/summary", version=live.feedback_version)
+            if "_error" in summary:
+                if st.session_state.last_good_summary:
+                    st.info("Showing cached summary (backend slow).")
+                    summary = st.session_state.last_good_summary
+                else:
+                    summary = {"👍": 0, "👎": 0}
             else:
-                summary = {"👍": 0, "👎": 0}
-        else:
-            st.session_state.last_good_summary = summary
+                st.session_state.last_good_summary = summary
+
+            total_fb = int(summary.get("👍", 0)) + int(summary.get("👎", 0))
+            helpful_pct = (summary.get("👍", 0) / total_fb * 100) if total_fb else 0.0
+            latencies = list(live.latencies) or st.session_state.latency_list
+            avg_latency = sum(latencies) / len(latencies) if latencies else 0
+
+            esc = get_json_cached("/summary/" + call_id(), version=live.escalation_version)
+            if "_error" in esc and st.session_state.last_good_session_report:
+                st.info("Using last session report (backend slow).")
+                esc = st.session_state.last_good_session_report
+            elif "_error" not in esc:
+                st.session_state.last_good_session_report = esc
+
+            voice_quality = esc.get("voice_quality", 88)
+
+            # 🔹 KPI Metrics
+            m1, m2, m3 = st.columns(3)
+            m1.metric("👍 Helpful", summary.get("👍", 0), help="Positive feedback")
+            m2.metric("👎 Unhelpful", summary.get("👎", 0), help="Negative feedback")
+            m3.metric("📊 Total Feedback", total_fb)
+
+            m4, m5, m6 = st.columns(3)
+            m4.metric("⚠️ Escalation", esc.get("escalation", "N/A"))
+            m5.metric("⏱️ Avg Latency (ms)", int(avg_latency))
+            m6.metric("🎙️ Voice Quality", f"{voice_quality}%", help="Based on audio clarity/signal")
+
+            # 🔸 Helpful Ratio
+            st.subheader("🧮 Helpful Feedback Ratio")
+            st.progress(helpful_pct / 100 if helpful_pct else 0.0)
+            st.caption(f"{helpful_pct:.1f}% of all feedback is marked as helpful")
+
+            # 🔸 Escalation Notice
+            if esc.get("escalation") == "Recommended":
+                st.warning("⚠️ Escalation recommended for this session")
+            else:
+                st.success("✅ No escalation needed")
+
+            # 🔸 Live Escalations (all calls, pushed by the backend)
+            if live.escalations:
+                st.subheader("🚨 Live Escalations")
+                for e in list(live.escalations)[:5]:
+                    when = time.strftime("%H:%M:%S", time.localtime(e.get("ts", 0)))
+                    # Plain text: call ids come from clients, never render them as markdown
+                    st.text(f"{when}  {e.get('call_id', '?')} – "
+                            f"{e.get('sentiment', '')}/{e.get('compliance', '')}")
+
+            # 🔸 Feedback Timeline (pre-bucketed by the backend, ≤ 500 points)
+            timeline = get_json_cached("/feedback/timeline", version=live.feedback_version)
+            if "_error" in timeline and st.session_state.last_good_history:
+                st.info("Showing cached feedback timeline (backend slow).")
+                timeline = st.session_state.last_good_history
+            elif "_error" not in timeline:
+                st.session_state.last_good_history = timeline
+
+            points = timeline.get("points", []) if isinstance(timeline, dict) else []
+            if points:
+                timeline_df = pd.DataFrame(points)
+                timeline_df["t"] = pd.to_datetime(timeline_df["t"])
+
+                import plotly.express as px
+                fig = px.bar(
+                    timeline_df,
+                    x="t",
+                    y=["👍", "👎"],
+                    title=f"🕒 Feedback Timeline (per {timeline.get('bucket', 'bucket')})",
+                    color_discrete_map={"👍": "#2ECC71", "👎": "#E74C3C"},
+                    height=400,
+                )
+                fig.update_layout(xaxis_title="", yaxis_title="Feedback", legend_title="")
+                st.plotly_chart(fig, use_container_width=True)
+
+                # 🔸 Feedback Table (one page per request) & Export
+                st.subheader("📄 Feedback Log")
+                page_size = 50
+                pages = max(1, -(-total_fb // page_size))
+                page = st.number_input("Page", min_value=1, max_value=pages, value=1, key="fb_page")
+                rows = get_json_cached(
+                    "/feedback/history",
+                    params={"offset": (page - 1) * page_size, "limit": page_size},
+                    version=live.feedback_version,
+                )
+                if isinstance(rows, list) and rows:
+                    page_df = pd.DataFrame(rows)
+                    page_df["feedback"] = page_df["helpful"].map({True: "👍", False: "👎"})
+                    st.dataframe(
+                        page_df.reindex(columns=["timestamp", "text", "feedback"]),
+                        use_container_width=True,
+                        hide_index=True,
+                    )
+                st.caption(f"Page {page} of {pages} · newest first")
 
-        total_fb = int(summary.get("👍", 0)) + int(summary.get("👎", 0))
-        helpful_pct = (summary.get("👍", 0) / total_fb * 100) if total_fb else 0.0
-        avg_latency = (
-            sum(st.session_state.latency_list) / len(st.session_state.latency_list)
-            if st.session_state.latency_list else 0
-        )
+                # CSV is streamed by the backend, never built in this process
+                st.link_button(
+                    "📥 Download Feedback as CSV",
+                    _url("/feedback/export.csv"),
+                    help="Export feedback for auditing/reporting"
+                )
+            else:
+                st.info("ℹ️ No timestamped feedback yet. Try interacting with the Assistant tab.")
 
-        esc = get_json("/summary/" + CALL_ID, connect_timeout=3, read_timeout=12, default={"_error": "unavailable"})
-        if "_error" in esc and st.session_state.last_good_session_report:
-            st.info("Using last session report (backend slow).")
-            esc = st.session_state.last_good_session_report
-        elif "_error" not in esc:
-            st.session_state.last_good_session_report = esc
-
-        voice_quality = esc.get("voice_quality", 88)
-
-        # 🔹 KPI Metrics
-        m1, m2, m3 = st.columns(3)
-        m1.metric("👍 Helpful", summary.get("👍", 0), help="Positive feedback")
-        m2.metric("👎 Unhelpful", summary.get("👎", 0), help="Negative feedback")
-        m3.metric("📊 Total Feedback", total_fb)
-
-        m4, m5, m6 = st.columns(3)
-        m4.metric("⚠️ Escalation", esc.get("escalation", "N/A"))
-        m5.metric("⏱️ Avg Latency (ms)", int(avg_latency))
-        m6.metric("🎙️ Voice Quality", f"{voice_quality}%", help="Based on audio clarity/signal")
-
-        # 🔸 Helpful Ratio
-        st.subheader("🧮 Helpful Feedback Ratio")
-        st.progress(helpful_pct / 100 if helpful_pct else 0.0)
-        st.caption(f"{helpful_pct:.1f}% of all feedback is marked as helpful")
-
-        # 🔸 Escalation Notice
-        if esc.get("escalation") == "Recommended":
-            st.warning("⚠️ Escalation recommended for this session")
-        else:
-            st.success("✅ No escalation needed")
-
-        # 🔸 Feedback History + Graph
-        feedback_data = get_json_cached("/feedback/history")
-        if "_error" in feedback_data and st.session_state.last_good_history:
-            st.info("Showing cached feedback history (backend slow).")
-            feedback_data = st.session_state.last_good_history
-        elif isinstance(feedback_data, list):
-            st.session_state.last_good_history = feedback_data
-
-        if isinstance(feedback_data, list) and any(isinstance(f, dict) and "timestamp" in f for f in feedback_data):
-            clean_data = [f for f in feedback_data if isinstance(f, dict) and "timestamp" in f]
-            feedback_df = pd.DataFrame(clean_data)
-            feedback_df["timestamp"] = pd.to_datetime(feedback_df["timestamp"], errors="coerce")
-            feedback_df = feedback_df.dropna(subset=["timestamp"])
-            feedback_df["feedback"] = feedback_df["helpful"].map({True: "👍", False: "👎"})
-
-            import plotly.express as px
-            fig = px.scatter(
-                feedback_df,
-                x="timestamp",
-                y="feedback",
-                title="🕒 Feedback Timeline",
-                color="feedback",
-                color_discrete_map={"👍": "#2ECC71", "👎": "#E74C3C"},
-                height=400,
-            )
-            fig.update_layout(yaxis_title="Feedback")
-            st.plotly_chart(fig, use_container_width=True)
-
-            # 🔸 Feedback Table & Export
-            st.subheader("📄 Feedback Log")
-            st.dataframe(feedback_df[["timestamp", "text", "feedback"]], use_container_width=True)
-
-            csv = feedback_df.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "📥 Download Feedback as CSV",
-                csv,
-                "callmate_feedback.csv",
-                "text/csv",
-                help="Export feedback for auditing/reporting"
-            )
-        else:
-            st.info("ℹ️ No timestamped feedback yet. Try interacting with the Assistant tab.")
+        except Exception as err:
+            st.error("🚨 Dashboard Error")
+            st.exception(err)
 
-    except Exception as err:
-        st.error("🚨 Dashboard Error")
-        st.exception(err)
+    dashboard_panel()
@@ -0,0 +1,65 @@
+import pytest
+
+from backend import pii_redactor
+from backend.name_matcher import NameIndex, build_table
+from backend.pii_redactor import StreamRedactor
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    # Fixed name dictionary, and no audit log writes from redact()
+    index = NameIndex(build_table(["Jane Smith"]))
+    monkeypatch.setattr(pii_redactor, "find_names", index.find_spans)
+    monkeypatch.setattr(pii_redactor, "log_event", lambda *a, **k: None)
+
+
+def run(chunks):
+    """Feeds `chunks`; returns (turns released, peek() after each chunk, flushed turns)."""
+    stream, turns, peeks = StreamRedactor(), [], []
+    for chunk in chunks:
+        turns += stream.feed(chunk)
+        peeks.append(stream.peek())
+    return turns, peeks, stream.flush()
+
+
+def leaked(texts, fragments):
+    return [f for f in fragments for t in texts if f in t]
+
+
+def test_card_split_across_chunks():
+    turns, peeks, rest = run(["my card is 4111 1111", "1111 1111 thanks for that", "yes"])
+    assert not leaked(turns + peeks + rest, ["4111", "1111"])
+    assert any("[CARD]" in t for t in turns + rest)
+
+
+def test_partial_card_is_masked_mid_call():
+    _, peeks, _ = run(["my card is 4111 1111 1111"])
+    assert not leaked(peeks, ["4111", "1111"])
+
+
+@pytest.mark.parametrize("chunks", [
+    ["my email is john.doe@exa", "mple.com ok", "bye now"],
+    ["write to john.doe@", "example.com please", "thanks"],
+])
+def test_email_split_across_chunks(chunks):
+    turns, peeks, rest = run(chunks)
+    assert not leaked(turns + peeks + rest, ["john", "doe", "exa", "example"])
+    assert any("[EMAIL]" in t for t in turns + rest)
+
+
+def test_name_split_across_chunks():
+    turns, peeks, rest = run(["I spoke to Jane", "Smith yesterday about it", "ok"])
+    assert not leaked(turns + peeks + rest, ["Jane", "Smith"])
+    assert any("[NAME]" in t for t in turns + rest)
+
+
+def test_chunks_become_whole_turns():
+    turns, _, rest = run(["hello there", "how are you", "fine thanks"])
+    assert turns + rest == ["hello there", "how are you", "fine thanks"]
+
+
+def test_turn_is_released_only_when_complete():
+    stream = StreamRedactor()
+    assert stream.feed("one two three four") == []        # tail still held
+    assert stream.feed("five six") == ["one two three four"]
+    assert stream.flush() == ["five six"]